@@ -0,0 +1,67 @@
+""" This module provides the start point for the render coordinator. The
+    coordinator plans the renders without executing Blender and leases
+    chunks of the plan to the Blender processes started with the
+    --coordinator option, on this or any other node.
+
+    Execution: python3 coordinator.py [--host HOST] [--port PORT]
+                                      [--chunk-size N] [--lease-seconds N]
+"""
+
+from argparse import ArgumentParser
+from os import path, getcwd
+from sys import exit, stderr
+
+from src.classes.coordinator import Coordinator
+from src.parsers.directory_parser import parse_directories
+from src.parsers.settings_parser import app_settings, blender_settings
+from src.utilities.plan_utility import PlanUtility
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Leases the render plan to workers")
+    parser.add_argument("--host", default="localhost",
+                        help="address to listen on, 0.0.0.0 for all nodes")
+    parser.add_argument("--port", type=int, default=5555,
+                        help="port to listen on")
+    parser.add_argument("--chunk-size", type=int, default=10,
+                        help="number of iterations leased at once")
+    parser.add_argument("--lease-seconds", type=float, default=300,
+                        help="seconds before an unrenewed lease is issued "
+                             "to another worker")
+    arguments = parser.parse_args()
+
+    # the coordinator uses the same settings files as main.py
+    app_settings(path.join(getcwd(), 'config', 'app_settings.json'))
+    blender_settings(path.join(getcwd(), 'config', 'blender_settings.json'))
+
+    files = parse_directories()
+    # the workers load the materials from the material files, the render
+    # space only matches theirs when the material names are known
+    if not PlanUtility.materials_known(files):
+        stderr.write("Every material file needs to be indexed before "
+                     "coordinating, run the indexer first\n")
+        exit(1)
+
+    # the workers would render fewer materials than the coordinator leases
+    if PlanUtility.materials_merged():
+        stderr.write("Material dedup needs to be disabled before "
+                     "coordinating\n")
+        exit(1)
+
+    space = PlanUtility.create_space(files)
+    collection_count = len(app_settings().immaterial_collections())
+    coordinator = Coordinator(
+        [row['iteration'] for row in PlanUtility.plan(space)],
+        lambda iteration:
+            space.states_for_iteration(iteration)[:collection_count],
+        space.total(),
+        arguments.chunk_size,
+        arguments.lease_seconds
+    )
+    status = coordinator.status()
+    print("Coordinating " + str(status['chunks']) + " chunks on "
+          + arguments.host + ":" + str(arguments.port))
+    coordinator.serve(arguments.host, arguments.port)
+    print("Completed " + str(coordinator.status()['completed'])
+          + " chunks, reissued " + str(coordinator.status()['reissued'])
+          + " expired leases")
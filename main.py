@@ -1,10 +1,14 @@
 """ This module provides the main start point for the app.
     Any GUI updates will be added and displayed via this module.
 
-    Execution: python3 main.py
+    Execution: python3 main.py [--workers N] [--resume] [--iterations RANGES]
+                               [--render-timeout SECONDS] [--max-restarts N]
+                               [--pool] [--shutdown-pool]
+                               [--coordinator HOST:PORT]
 """
 
 from os import path, getcwd
+from sys import argv
 
 from src.entry import execute
 
@@ -22,4 +26,4 @@ if __name__ == "__main__":
         full_paths[entry] = path.join(getcwd(), rel_path)
 
     # call into the entry point
-    execute(full_paths)
+    execute(full_paths, argv[1:])
@@ -0,0 +1,46 @@
+""" This module provides the start point for the render planner. The
+    planner enumerates everything the app will render without
+    executing Blender.
+
+    Execution: python3 plan.py [--output FILE] [--format jsonl|csv]
+"""
+
+from argparse import ArgumentParser
+from os import path, getcwd
+from sys import stderr, stdout
+
+from src.parsers.directory_parser import parse_directories
+from src.parsers.settings_parser import app_settings, blender_settings
+from src.utilities.plan_utility import PlanUtility
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Enumerates the render plan")
+    parser.add_argument("--output", default=None,
+                        help="file to write the plan to, stdout by default")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        default="jsonl", help="format of the plan")
+    arguments = parser.parse_args()
+
+    # the planner uses the same settings files as main.py
+    app_settings(path.join(getcwd(), 'config', 'app_settings.json'))
+    blender_settings(path.join(getcwd(), 'config', 'blender_settings.json'))
+
+    if PlanUtility.materials_merged():
+        stderr.write("Material dedup is enabled, the merged materials are "
+                     "listed but will not be rendered\n")
+
+    space = PlanUtility.create_space(parse_directories())
+    stream = stdout if arguments.output is None \
+        else open(arguments.output, "w", newline='')
+    # the plan is streamed, no rows are retained
+    if arguments.format == "csv":
+        count = PlanUtility.write_csv(space, PlanUtility.plan(space), stream)
+    else:
+        count = PlanUtility.write_jsonl(PlanUtility.plan(space), stream)
+
+    if stream is not stdout:
+        stream.close()
+
+    stderr.write("Planned " + str(count) + " out of "
+                 + str(space.total()) + " renders\n")
@@ -5,7 +5,8 @@ from bpy import context, data, ops
 from typing import Optional
 
 from src.classes.exceptions import CameraNotFoundException
-from src.parsers.settings_parser import app_settings, blender_settings
+from src.classes.scene_index import scene_index
+from src.parsers.settings_parser import blender_settings
 from src.trackers.stat_tracker import stat_tracker
 from src.trackers.time_tracker import time_tracker
 
@@ -67,20 +68,12 @@ class Camera:
 
         time_tracker().start("camera_align")
 
-        objs_hide_from_render = list()
-        # exclude all material meshes from view
-        for collection in data.collections:
-            if collection.name in app_settings().material_collection():
-                for obj in collection.all_objects:
-                    if obj.type == 'MESH':
-                        objs_hide_from_render.append(obj)
-
         # hide all material objects from render
-        for obj in objs_hide_from_render:
+        for obj in scene_index().material_meshes():
             obj.hide_render = True
 
-        # deselect all material objects
-        for obj in data.objects:
+        # deselect all objects, only the selected objects need to be visited
+        for obj in context.selected_objects:
             obj.select_set(False)
 
         # select all other objects that are not hidden
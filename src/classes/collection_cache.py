@@ -0,0 +1,202 @@
+""" This module provides the resident collection cache to the app. Appended
+    collections are kept loaded and toggled instead of being cleared and
+    appended again.
+"""
+
+from collections import OrderedDict
+from os import path
+from typing import Any, Optional
+from zlib import crc32
+
+from bpy import context, data
+
+from src.classes.scene_index import scene_index
+from src.parsers.settings_parser import app_settings
+from src.trackers.stat_tracker import stat_tracker
+from src.utilities.append_utility import AppendUtility
+from src.utilities.clear_utility import ClearUtility
+
+
+class CollectionCache:
+    """ This class keeps the collections appended from each file resident
+        in the blend data. The active file of a collection holds the
+        collection's name and is included in the view layer, the others
+        are renamed and excluded from the view layer so they are neither
+        visible nor rendered. The least recently used collections are
+        cleared when the estimated memory exceeds the budget. """
+
+    # separates the collection name from the file in a resident name
+    SEPARATOR = '|'
+    # estimated bytes of memory for each vertex, face and face corner
+    VERTEX_BYTES = 64
+    POLYGON_BYTES = 48
+    LOOP_BYTES = 32
+
+    def __init__(self,
+                 budget_mb: int) -> None:
+        self._budget = budget_mb * 1024 * 1024
+        # maps (collection, file key) to the estimated memory of the
+        # collection, ordered from the least to the most recently used
+        self._resident = OrderedDict()
+        self._active = dict()
+
+    def enabled(self) -> bool:
+        """ Returns whether collections are kept resident. """
+
+        return self._budget > 0
+
+    @staticmethod
+    def file_key(file_path: str) -> str:
+        """ Returns the key of a file, its path, modified time and size, so
+            an edited file is appended again rather than reused. """
+
+        return path.abspath(file_path) + '|' \
+            + str(path.getmtime(file_path)) + '|' \
+            + str(path.getsize(file_path))
+
+    @staticmethod
+    def resident_name(collection: str,
+                      file_key: str) -> str:
+        """ Returns the name of an inactive resident collection. The file
+            is identified by a checksum of its key, since Blender truncates
+            long names. """
+
+        return collection + CollectionCache.SEPARATOR \
+            + format(crc32(file_key.encode()), '08x')
+
+    @staticmethod
+    def layer_collection(name: str,
+                         layer_collection: Optional[Any] = None) \
+            -> Optional[Any]:
+        """ Returns the view layer collection of the provided collection. """
+
+        if layer_collection is None:
+            layer_collection = context.view_layer.layer_collection
+
+        if layer_collection.name == name:
+            return layer_collection
+
+        for child in layer_collection.children:
+            found = CollectionCache.layer_collection(name, child)
+            if found is not None:
+                return found
+
+        return None
+
+    @staticmethod
+    def set_excluded(name: str,
+                     excluded: bool) -> None:
+        """ Excludes or includes the provided collection in the view layer. """
+
+        layer_collection = CollectionCache.layer_collection(name)
+        if layer_collection is not None:
+            layer_collection.exclude = excluded
+
+    @staticmethod
+    def estimate_memory(name: str) -> int:
+        """ Returns the estimated memory in bytes of the meshes in the
+            provided collection, shared meshes are counted once. """
+
+        meshes = {obj.data for obj in data.collections[name].all_objects
+                  if obj.type == 'MESH'}
+        return sum(len(mesh.vertices) * CollectionCache.VERTEX_BYTES
+                   + len(mesh.polygons) * CollectionCache.POLYGON_BYTES
+                   + len(mesh.loops) * CollectionCache.LOOP_BYTES
+                   for mesh in meshes)
+
+    def inactive_names(self) -> set:
+        """ Returns the names of the resident collections that are not
+            active, their objects are not part of the scene. """
+
+        return {CollectionCache.resident_name(*key) for key in self._resident
+                if self._active.get(key[0]) != key}
+
+    def deactivate(self,
+                   collection: str) -> None:
+        """ Renames and excludes the active file of the provided collection. """
+
+        key = self._active.pop(collection, None)
+        if key is None or collection not in data.collections:
+            return
+
+        data.collections[collection].name = \
+            CollectionCache.resident_name(*key)
+        scene_index().rename(collection, CollectionCache.resident_name(*key))
+        CollectionCache.set_excluded(CollectionCache.resident_name(*key),
+                                     True)
+
+    def drop_stale(self,
+                   collection: str,
+                   key: tuple) -> None:
+        """ Clears the inactive resident collections of the provided key's
+            file that were appended before the file last changed. """
+
+        file_path = key[1].split('|')[0]
+        for stale_key in list(self._resident):
+            if stale_key[0] == collection and stale_key != key \
+                    and stale_key[1].split('|')[0] == file_path \
+                    and self._active.get(collection) != stale_key:
+                ClearUtility.clear_collection(
+                    CollectionCache.resident_name(*stale_key)
+                )
+                del self._resident[stale_key]
+
+    def evict(self) -> None:
+        """ Clears the least recently used inactive collections until the
+            estimated memory is within the budget. """
+
+        for key in list(self._resident):
+            if sum(self._resident.values()) <= self._budget:
+                break
+            if self._active.get(key[0]) == key:
+                continue
+
+            ClearUtility.clear_collection(CollectionCache.resident_name(*key))
+            del self._resident[key]
+            stat_tracker().update_stat("resident_evict", key[0])
+
+    def activate(self,
+                 file_path: str,
+                 collection: str) -> None:
+        """ Makes the provided file's collection the active collection. The
+            resident collection is included again when available, the file
+            is appended otherwise. """
+
+        key = (collection, CollectionCache.file_key(file_path))
+        if self._active.get(collection) == key \
+                and collection in data.collections:
+            return
+
+        self.deactivate(collection)
+        self.drop_stale(collection, key)
+        name = CollectionCache.resident_name(*key)
+        if key in self._resident and name in data.collections:
+            data.collections[name].name = collection
+            scene_index().rename(name, collection)
+            CollectionCache.set_excluded(collection, False)
+            self._resident.move_to_end(key)
+            stat_tracker().update_stat("resident_hit", collection)
+        else:
+            # the resident collection was cleared outside of the cache
+            ClearUtility.clear_collection(collection)
+            AppendUtility.load_from_file(file_path, collection)
+            self._resident[key] = CollectionCache.estimate_memory(collection)
+            self._resident.move_to_end(key)
+
+        self._active[collection] = key
+        self.evict()
+
+
+_instance = None
+
+
+def collection_cache() -> CollectionCache:
+    """ Singleton accessor for this class. """
+
+    global _instance
+    if _instance is None:
+        _instance = CollectionCache(
+            app_settings().parameters().resident_cache_mb()
+        )
+
+    return _instance
@@ -1,6 +1,7 @@
 """ This module handles collection operations.
 """
 
+from src.classes.collection_cache import collection_cache
 from src.classes.exceptions import InvalidFileException
 from src.classes.overseer import Overseer
 from src.utilities.append_utility import AppendUtility
@@ -12,6 +13,9 @@ class CollectionOverseer(Overseer):
     """ This class provides the overseer for collections.
         This is used to encapsulate collections with a simple interface. """
 
+    axis_kind = 'collection'
+    modifies_scene = True
+
     def __init__(self,
                  repeat: int,
                  collection: str,
@@ -20,33 +24,43 @@ class CollectionOverseer(Overseer):
         self._collection = collection
         self._files = files
         self._names = CleanUtility.cleanup_file_components(files)
-        self._file_index = 0
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the scene.
             This overseer handles collection operations. """
 
         # ensure that we are using a valid file
-        if self._file_index >= len(self._files):
+        if state >= len(self._files):
             raise InvalidFileException("Hit a file index that "
                                        "is out of the valid range: "
-                                       + str(self._file_index) + ", max: "
+                                       + str(state) + ", max: "
                                        + str(len(self._files))
                                        + ", for collection: " + self._collection)
 
-        # only perform the update when required
-        if self._current_count < self._repeat:
-            self._current_count += 1
-            return
+        if collection_cache().enabled():
+            # switch to the resident collection, loading it when needed
+            collection_cache().activate(self._files[state], self._collection)
+        else:
+            # begin by clearing the old objects for the collection
+            ClearUtility.clear_collection(self._collection)
+            # use the append utility to load the new collection's objects
+            AppendUtility.load_from_file(self._files[state],
+                                         self._collection)
+        self._state = state
+
+    def axis_name(self) -> str:
+        """ Returns the name of the axis this overseer forms in the
+            render space. This is the collection's name. """
+
+        return self._collection
 
-        self._current_count = 0
-        # begin by clearing the old objects for the collection
-        ClearUtility.clear_collection(self._collection)
-        # use the append utility to retrieve the new collection's objects
-        AppendUtility.append_from_file(self._files[self._file_index],
-                                       self._collection)
-        self._file_index += 1
-        self._file_index %= len(self._files)
+    def states_for_files(self,
+                         file_paths: list) -> list:
+        """ Returns the states that load any of the provided files. """
+
+        return [state for state, file_path in enumerate(self._files)
+                if file_path in file_paths]
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer. This is equivalent
@@ -54,11 +68,11 @@ class CollectionOverseer(Overseer):
 
         return len(self._files)
 
-    def __str__(self):
-        # the currently appended file is one before the index tracker
-        currently_appended_index = self._file_index - 1
-        currently_appended_index %= len(self._files)
-        return str(self._names[currently_appended_index])
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        return str(self._names[state])
 
 
 def collection_dispatcher(*args, **kwargs) -> CollectionOverseer:
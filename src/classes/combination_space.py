@@ -0,0 +1,142 @@
+""" This module contains the combination space type. This indexes the
+    material combinations without computing all of them.
+"""
+
+from itertools import combinations, permutations, product
+from math import comb, perm
+from typing import Iterator
+
+
+class CombinationSpace:
+    """ This class provides the combinations of a pool of materials in the
+        same order as the itertools function of the combinatorial type. The
+        number of combinations is computed in closed form, and each
+        combination is computed from its index, so no combination is held
+        in memory. The specified type indexes the provided combinations. """
+
+    TYPES = ('product', 'combinations', 'permutations', 'specified')
+
+    def __init__(self,
+                 pool: list,
+                 length: int,
+                 combinatorial_type: str) -> None:
+        self._pool = list(pool)
+        self._length = length
+        self._type = combinatorial_type
+
+    def __len__(self) -> int:
+        """ Returns the number of combinations. """
+
+        n = len(self._pool)
+        if self._type == 'product':
+            return n ** self._length
+        if self._type == 'combinations':
+            return comb(n, self._length)
+        if self._type == 'permutations':
+            return perm(n, self._length)
+
+        return n
+
+    def __iter__(self) -> Iterator[tuple]:
+        """ Yields each combination in order. """
+
+        if self._type == 'product':
+            return product(self._pool, repeat=self._length)
+        if self._type == 'combinations':
+            return combinations(self._pool, self._length)
+        if self._type == 'permutations':
+            return permutations(self._pool, self._length)
+
+        return iter(self._pool)
+
+    def __getitem__(self,
+                    index: int) -> tuple:
+        """ Returns the combination at the provided index. """
+
+        if not 0 <= index < len(self):
+            raise IndexError("Combination index out of range: " + str(index))
+
+        n = len(self._pool)
+        if self._type == 'product':
+            # the index is the combination's digits in base n
+            positions = list()
+            for _ in range(self._length):
+                index, position = divmod(index, n)
+                positions.insert(0, position)
+
+            return tuple(self._pool[position] for position in positions)
+
+        if self._type == 'combinations':
+            # choose each position as the first one whose block of
+            # combinations contains the index
+            combo = list()
+            position = 0
+            for remaining in range(self._length, 0, -1):
+                while index >= comb(n - position - 1, remaining - 1):
+                    index -= comb(n - position - 1, remaining - 1)
+                    position += 1
+
+                combo.append(self._pool[position])
+                position += 1
+
+            return tuple(combo)
+
+        if self._type == 'permutations':
+            # each unused position heads a block of equal size
+            unused = list(range(n))
+            combo = list()
+            for remaining in range(self._length, 0, -1):
+                block = perm(len(unused) - 1, remaining - 1)
+                combo.append(self._pool[unused.pop(index // block)])
+                index %= block
+
+            return tuple(combo)
+
+        return self._pool[index]
+
+    def index(self,
+              combo: tuple) -> int:
+        """ Returns the index of the provided combination. Raises a
+            ValueError when it is not a combination of this space. """
+
+        if self._type == 'specified':
+            return [tuple(specified) for specified
+                    in self._pool].index(tuple(combo))
+
+        if len(combo) != self._length:
+            raise ValueError("Invalid combination length: " + str(combo))
+
+        positions = [self._pool.index(material) for material in combo]
+        n = len(self._pool)
+        index = 0
+        if self._type == 'product':
+            for position in positions:
+                index = index * n + position
+
+            return index
+
+        if self._type == 'combinations':
+            if any(first >= second for first, second
+                   in zip(positions, positions[1:])):
+                raise ValueError("Invalid combination order: " + str(combo))
+
+            previous = -1
+            for offset, position in enumerate(positions):
+                remaining = self._length - offset
+                # skip the blocks headed by the positions before this one
+                for skipped in range(previous + 1, position):
+                    index += comb(n - skipped - 1, remaining - 1)
+                previous = position
+
+            return index
+
+        if len(set(positions)) != len(positions):
+            raise ValueError("Invalid permutation: " + str(combo))
+
+        unused = list(range(n))
+        for offset, position in enumerate(positions):
+            block = perm(len(unused) - 1, self._length - offset - 1)
+            index += unused.index(position) * block
+            unused.remove(position)
+
+        return index
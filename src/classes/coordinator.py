@@ -0,0 +1,210 @@
+""" This module contains the render coordinator. The coordinator hands out
+    the render plan in leased chunks to Blender processes on any node.
+"""
+
+from socket import AF_INET, SOCK_STREAM, socket
+from socketserver import StreamRequestHandler, TCPServer
+from time import monotonic
+from typing import Callable, Optional
+
+from src.utilities.worker_utility import WorkerUtility
+
+
+class Coordinator:
+    """ This class owns the render plan and leases chunks of iterations to
+        workers. A lease that is not renewed or completed before it expires
+        is issued again to the next worker, so the chunks of a dead worker
+        are always rendered. Workers are given the chunks whose collection
+        states match the collections they currently have appended. """
+
+    # seconds a worker waits before asking for a chunk again
+    RETRY_SECONDS = 5
+
+    def __init__(self,
+                 iterations: list,
+                 collection_states: Callable[[int], list],
+                 total: int,
+                 chunk_size: int = 10,
+                 lease_seconds: float = 300,
+                 clock: Callable[[], float] = monotonic) -> None:
+        """ Iterations are the planned iterations in traversal order and
+            collection_states returns the collection states of an
+            iteration. Total is the size of the iteration space, used to
+            verify that the workers use the same settings. """
+
+        chunk_size = max(chunk_size, 1)
+        self._chunks = [iterations[start:start + chunk_size]
+                        for start in range(0, len(iterations), chunk_size)]
+        # chunks are matched by the collection states of their first render
+        self._chunk_states = [collection_states(chunk[0])
+                              for chunk in self._chunks]
+        self._total = total
+        self._lease_seconds = lease_seconds
+        self._clock = clock
+        self._pending = list(range(len(self._chunks)))
+        self._leases = dict()
+        self._completed = set()
+        self._reissued = 0
+
+    def expire_leases(self) -> None:
+        """ Returns the chunks of the expired leases to the pending chunks,
+            in plan order. """
+
+        now = self._clock()
+        expired = [chunk for chunk, (worker, expiry) in self._leases.items()
+                   if expiry <= now]
+        for chunk in expired:
+            del self._leases[chunk]
+            self._pending.append(chunk)
+            self._reissued += 1
+
+        self._pending.sort()
+
+    @staticmethod
+    def affinity(chunk_states: list,
+                 worker_states: Optional[list]) -> int:
+        """ Returns the number of collections, from the outermost, that the
+            chunk shares with the worker's appended collections. """
+
+        if worker_states is None:
+            return 0
+
+        affinity = 0
+        for chunk_state, worker_state in zip(chunk_states, worker_states):
+            if chunk_state != worker_state:
+                break
+            affinity += 1
+
+        return affinity
+
+    def lease(self,
+              worker: str,
+              collection_states: Optional[list] = None) -> dict:
+        """ Leases the pending chunk with the highest affinity to the
+            provided worker's collection states, the earliest chunk in the
+            plan wins ties. """
+
+        self.expire_leases()
+        if not self._pending:
+            if self.finished():
+                return {'status': 'finished'}
+            return {'status': 'wait', 'retry': Coordinator.RETRY_SECONDS}
+
+        chunk = max(self._pending,
+                    key=lambda pending: (Coordinator.affinity(
+                        self._chunk_states[pending], collection_states
+                    ), -pending))
+        self._pending.remove(chunk)
+        self._leases[chunk] = (worker, self._clock() + self._lease_seconds)
+        return {'status': 'leased',
+                'chunk': chunk,
+                'iterations': self._chunks[chunk],
+                'total': self._total,
+                'lease_seconds': self._lease_seconds}
+
+    def renew(self,
+              worker: str,
+              chunk: int) -> dict:
+        """ Extends the provided worker's lease of the chunk. Returns an
+            expired status when the chunk was issued to another worker. """
+
+        self.expire_leases()
+        if self._leases.get(chunk, (None, 0))[0] != worker:
+            return {'status': 'expired'}
+
+        self._leases[chunk] = (worker, self._clock() + self._lease_seconds)
+        return {'status': 'renewed'}
+
+    def complete(self,
+                 worker: str,
+                 chunk: int) -> dict:
+        """ Marks the provided chunk as completed. A chunk completed after
+            its lease expired is still accepted, it is not rendered again. """
+
+        if chunk not in self._completed:
+            self._completed.add(chunk)
+            if chunk in self._pending:
+                self._pending.remove(chunk)
+            if chunk in self._leases:
+                del self._leases[chunk]
+
+        return {'status': 'completed'}
+
+    def status(self) -> dict:
+        """ Returns the progress of the plan. """
+
+        self.expire_leases()
+        return {'status': 'running',
+                'chunks': len(self._chunks),
+                'pending': len(self._pending),
+                'leased': len(self._leases),
+                'completed': len(self._completed),
+                'reissued': self._reissued}
+
+    def finished(self) -> bool:
+        """ Returns whether every chunk has been completed. """
+
+        return len(self._completed) == len(self._chunks)
+
+    def handle(self,
+               message: dict) -> dict:
+        """ Returns the reply to the provided message. """
+
+        if message['type'] == 'lease':
+            return self.lease(message['worker'],
+                              message.get('collection_states'))
+        if message['type'] == 'renew':
+            return self.renew(message['worker'], message['chunk'])
+        if message['type'] == 'complete':
+            return self.complete(message['worker'], message['chunk'])
+        if message['type'] == 'status':
+            return self.status()
+
+        return {'status': 'invalid'}
+
+    def serve(self,
+              host: str,
+              port: int) -> None:
+        """ Serves the workers until every chunk has been completed. The
+            requests are short, so they are handled one at a time. """
+
+        coordinator = self
+
+        class Handler(StreamRequestHandler):
+            def handle(self) -> None:
+                message = WorkerUtility.receive(self.connection)
+                if message['type'] != 'closed':
+                    WorkerUtility.respond(self.connection,
+                                          coordinator.handle(message))
+
+        class Server(TCPServer):
+            # a restarted coordinator binds the same port right away
+            allow_reuse_address = True
+
+        with Server((host, port), Handler) as server:
+            server.timeout = Coordinator.RETRY_SECONDS
+            while not self.finished():
+                server.handle_request()
+
+    @staticmethod
+    def parse_address(address: str) -> tuple:
+        """ Returns the (host, port) pair of a HOST:PORT address. """
+
+        host, _, port = address.rpartition(':')
+        return host or 'localhost', int(port)
+
+    @staticmethod
+    def request(address: str,
+                message: dict,
+                timeout: Optional[float] = 60) -> dict:
+        """ Sends the provided message to the coordinator and returns its
+            reply. Returns a closed status when the coordinator has exited. """
+
+        try:
+            with socket(AF_INET, SOCK_STREAM) as connection:
+                connection.settimeout(timeout)
+                connection.connect(Coordinator.parse_address(address))
+                WorkerUtility.respond(connection, message)
+                return WorkerUtility.receive(connection)
+        except OSError:
+            return {'status': 'closed'}
@@ -0,0 +1,112 @@
+""" This module contains the hdri variants cache. The variants are reduced
+    copies of the hdris that are loaded in place of them.
+"""
+
+from hashlib import sha1
+from json import dump, load
+from os import makedirs, path
+from typing import Optional
+
+
+class HDRIVariants:
+    """ This class maps each hdri to its variants. A variant is a copy of
+        an hdri downsampled to a target width, optionally stored as half
+        float. Variants are stored by the hash of their source's contents
+        and their target, under the source's file name so the file name
+        components are unchanged. The manifest maps each source's path,
+        modified time and size to its hash, so resolving an hdri only needs
+        to stat it. """
+
+    MANIFEST = 'manifest.json'
+    EXTENSION = '.exr'
+    HASH_BLOCK_SIZE = 1 << 20
+
+    def __init__(self,
+                 variant_dir: str) -> None:
+        self._variant_dir = variant_dir
+        self._manifest = dict()
+        manifest_path = path.join(variant_dir, HDRIVariants.MANIFEST)
+        if path.isfile(manifest_path):
+            with open(manifest_path, "r") as manifest_file:
+                self._manifest = load(manifest_file)
+
+    @staticmethod
+    def file_key(hdri_path: str) -> str:
+        """ Returns the manifest key of an hdri, its path, modified time
+            and size. """
+
+        return path.abspath(hdri_path) + '|' \
+            + str(path.getmtime(hdri_path)) + '|' \
+            + str(path.getsize(hdri_path))
+
+    @staticmethod
+    def source_hash(hdri_path: str) -> str:
+        """ Returns the hash of the contents of the provided hdri. """
+
+        digest = sha1()
+        with open(hdri_path, "rb") as hdri_file:
+            block = hdri_file.read(HDRIVariants.HASH_BLOCK_SIZE)
+            while block:
+                digest.update(block)
+                block = hdri_file.read(HDRIVariants.HASH_BLOCK_SIZE)
+
+        return digest.hexdigest()
+
+    def variant_path(self,
+                     hdri_path: str,
+                     digest: str,
+                     width: int,
+                     half_float: bool) -> str:
+        """ Returns the path of the provided hdri's variant. """
+
+        target = digest + '_' + str(width) + ('_half' if half_float else '')
+        return path.join(self._variant_dir, target,
+                         path.basename(hdri_path))
+
+    def variant(self,
+                hdri_path: str,
+                width: int,
+                half_float: bool) -> Optional[str]:
+        """ Returns the provided hdri's variant, None when the variant has
+            not been written since the hdri last changed. """
+
+        try:
+            digest = self._manifest.get(HDRIVariants.file_key(hdri_path))
+        except OSError:
+            return None
+
+        if digest is None:
+            return None
+
+        variant_path = self.variant_path(hdri_path, digest, width, half_float)
+        return variant_path if path.isfile(variant_path) else None
+
+    def resolve(self,
+                hdri_path: str,
+                width: int,
+                half_float: bool) -> str:
+        """ Returns the hdri to load for the provided hdri, its variant
+            when available and the hdri itself otherwise. """
+
+        if width <= 0 or not hdri_path.lower().endswith(HDRIVariants.EXTENSION):
+            return hdri_path
+
+        return self.variant(hdri_path, width, half_float) or hdri_path
+
+    def record(self,
+               hdri_path: str,
+               digest: str) -> None:
+        """ Records the hash of the provided hdri. """
+
+        # the previous entry of a changed hdri is replaced
+        self._manifest = {key: value for key, value in self._manifest.items()
+                          if key.split('|')[0] != path.abspath(hdri_path)}
+        self._manifest[HDRIVariants.file_key(hdri_path)] = digest
+
+    def save(self) -> None:
+        """ Writes the manifest to disk. """
+
+        makedirs(self._variant_dir, exist_ok=True)
+        with open(path.join(self._variant_dir, HDRIVariants.MANIFEST), "w") \
+                as manifest_file:
+            dump(self._manifest, manifest_file, indent=4)
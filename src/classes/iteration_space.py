@@ -0,0 +1,146 @@
+""" This module contains the iteration space type. This describes
+    everything that is rendered without requiring Blender.
+"""
+
+from typing import Iterator, Optional
+
+from src.classes.exceptions import InvalidConfigurationException
+
+
+class IterationSpace:
+    """ This class provides the mixed radix space formed by a number of
+        axes. Each axis mirrors an overseer, the first axis is the
+        outermost overseer and changes the least often. """
+
+    def __init__(self,
+                 axes: list) -> None:
+        """ Axes is a list of (name, components) pairs, ordered from the
+            outermost axis to the innermost axis. Components can be any
+            sequence, e.g. a range when only the states are needed. """
+
+        self._names = [name for name, components in axes]
+        self._components = [components for name, components in axes]
+        self._strides = list()
+        stride = 1
+        for components in reversed(self._components):
+            self._strides.insert(0, stride)
+            stride *= len(components)
+
+        self._total = stride if self._components else 0
+
+    def names(self) -> list:
+        """ Returns the name of each axis. """
+
+        return self._names
+
+    def radices(self) -> list:
+        """ Returns the number of states of each axis. """
+
+        return [len(components) for components in self._components]
+
+    def components_for_axis(self,
+                            name: str) -> list:
+        """ Returns the components of the provided axis. """
+
+        return list(self._components[self._names.index(name)])
+
+    def total(self) -> int:
+        """ Returns the number of iterations in this space. """
+
+        return self._total
+
+    def states_for_iteration(self,
+                             iteration: int) -> list:
+        """ Returns the state of each axis for the provided iteration. """
+
+        return [(iteration // stride) % len(components)
+                for stride, components in zip(self._strides,
+                                              self._components)]
+
+    def iteration_for_states(self,
+                             states: list) -> int:
+        """ Returns the iteration for the provided state of each axis. """
+
+        return sum(state * stride
+                   for state, stride in zip(states, self._strides))
+
+    def components_for_states(self,
+                              states: list) -> list:
+        """ Returns the component of each axis for the provided states. """
+
+        return [components[state]
+                for state, components in zip(states, self._components)]
+
+    def changed_axes(self,
+                     previous_states: list,
+                     states: list) -> list:
+        """ Returns the names of the axes whose state differs between the
+            provided states. All axes change when there are no previous
+            states. """
+
+        if previous_states is None:
+            return list(self._names)
+
+        return [name for name, previous_state, state
+                in zip(self._names, previous_states, states)
+                if previous_state != state]
+
+    def odometer_iterations(self) -> Iterator[int]:
+        """ Yields each iteration in order. The inner axes are reset
+            whenever an outer axis changes. """
+
+        return iter(range(self._total))
+
+    def gray_iterations(self) -> Iterator[int]:
+        """ Yields each iteration in reflected mixed radix Gray code order.
+            Exactly one axis changes between successive iterations and the
+            inner axes change the most often. """
+
+        radices = self.radices()
+        for counter in range(self._total):
+            states = list()
+            reflected = False
+            for radix, state in zip(radices,
+                                    self.states_for_iteration(counter)):
+                # the inner axes are traversed backwards after an odd state
+                if reflected:
+                    state = radix - 1 - state
+                states.append(state)
+                reflected ^= state % 2 == 1
+
+            yield self.iteration_for_states(states)
+
+    traversal_map = {
+        'odometer': odometer_iterations,
+        'gray': gray_iterations
+    }
+
+    def iterations(self,
+                   traversal_order: str = 'odometer',
+                   nesting: Optional[list] = None) -> Iterator[int]:
+        """ Yields each iteration in the provided traversal order. The
+            nesting optionally reorders the axes for the traversal, from
+            the outermost to the innermost, without changing the
+            iterations themselves. """
+
+        if traversal_order not in IterationSpace.traversal_map:
+            raise InvalidConfigurationException("Invalid traversal order: "
+                                                + str(traversal_order))
+
+        traversal = IterationSpace.traversal_map[traversal_order]
+        if nesting is None or list(nesting) == list(range(len(self._names))):
+            yield from traversal(self)
+            return
+
+        # traverse a space with the nested axes, then map back to this space
+        nested_space = IterationSpace(
+            [(self._names[axis], range(len(self._components[axis])))
+             for axis in nesting]
+        )
+        states = [0] * len(self._names)
+        for nested_iteration in traversal(nested_space):
+            nested_states = nested_space.states_for_iteration(nested_iteration)
+            for axis, state in zip(nesting, nested_states):
+                states[axis] = state
+
+            yield self.iteration_for_states(states)
@@ -2,13 +2,12 @@
     This provides a simple interface for selecting the correct type.
 """
 
-from itertools import combinations, permutations, product
-
 from src.classes.exceptions import InvalidConfigurationException, \
     InvalidMaterialException
 from src.classes.overseer import Overseer
 from src.parsers.settings_parser import app_settings
 from src.utilities.clean_utility import CleanUtility
+from src.utilities.combination_utility import CombinationUtility
 from src.utilities.material_utility import MaterialUtility
 from src.utilities.mesh_utility import MeshUtility
 
@@ -17,6 +16,9 @@ class MaterialOverseer(Overseer):
     """ This class provides the generic material overseer class. This is
         intended to be inherited. """
 
+    axis_kind = 'material'
+    depends_on_scene = True
+
     def __init__(self,
                  repeat: int,
                  materials: list) -> None:
@@ -25,11 +27,30 @@ class MaterialOverseer(Overseer):
         self._names = CleanUtility.cleanup_other_components(
             [material.name for material in materials]
         )
-        self._material_index = 0
 
-    def update(self) -> None:
+    def materials(self) -> list:
+        """ Returns the materials this overseer applies. """
+
+        return self._materials
+
+    def material_indices_for_files(self,
+                                   file_paths: list) -> list:
+        """ Returns the indices of the materials loaded from any of the
+            provided files. """
+
+        return [index for index, material in enumerate(self._materials)
+                if MaterialUtility.source_files.get(material.name)
+                in file_paths]
+
+    def states_for_files(self,
+                         file_paths: list) -> list:
         raise NotImplementedError("MaterialOverseer "
-                                  "update must be implemented")
+                                  "states_for_files must be implemented")
+
+    def apply_state(self,
+                    state: int) -> None:
+        raise NotImplementedError("MaterialOverseer "
+                                  "apply_state must be implemented")
 
     def iteration_count(self) -> int:
         raise NotImplementedError("MaterialOverseer "
@@ -43,35 +64,39 @@ class DefaultMaterialOverseer(MaterialOverseer):
     def __init__(self,
                  repeat: int,
                  materials: list) -> None:
+        # duplicate materials would render the same image more than once
+        if app_settings().parameters().material_dedup_enabled():
+            materials = MaterialUtility.deduplicate_materials(materials)
         super(DefaultMaterialOverseer, self).__init__(repeat, materials)
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
-            This overseer simply sets the all meshes material to the next
-            material in order. """
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the scene.
+            This overseer simply sets the all meshes material to the
+            material for the state. """
 
         # ensure that we are using a valid material
-        if self._material_index >= len(self._materials):
+        if state >= len(self._materials):
             raise InvalidMaterialException("Hit a material index that is "
                                            "out of the valid range: "
-                                           + str(self._material_index)
+                                           + str(state)
                                            + ", max: "
                                            + str(len(self._materials))
                                            + ", for materials")
 
-        # only perform the update when required
-        if self._current_count < self._repeat:
-            self._current_count += 1
-            return
-
-        self._current_count = 0
         # set the material of all meshes in the scene
         meshes = MeshUtility.all_meshes_in_scene()
         MaterialUtility.update_meshes_with_material(
-            meshes, self._materials[self._material_index]
+            meshes, self._materials[state]
         )
-        self._material_index += 1
-        self._material_index %= len(self._materials)
+        self._state = state
+
+    def states_for_files(self,
+                         file_paths: list) -> list:
+        """ Returns the states that apply a material loaded from any of the
+            provided files. """
+
+        return self.material_indices_for_files(file_paths)
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer. This is equivalent
@@ -79,11 +104,11 @@ class DefaultMaterialOverseer(MaterialOverseer):
 
         return len(self._materials)
 
-    def __str__(self):
-        # the current material is one before the index tracker
-        current_material_index = self._material_index - 1
-        current_material_index %= len(self._materials)
-        return str(self._names[current_material_index])
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        return str(self._names[state])
 
 
 class VariableMaterialOverseer(MaterialOverseer):
@@ -91,27 +116,6 @@ class VariableMaterialOverseer(MaterialOverseer):
         This supports applying each material to different collections in the
         scene. See README for details about each type. """
 
-    @staticmethod
-    def specified_combos(combos: list,
-                         combo_length: int) -> list:
-        """ Each specified material is applied to the
-            collection that aligns with it in priority order"""
-
-        if combo_length < len(app_settings().collections()):
-            raise InvalidMaterialException(
-                "Insufficient specified materials for material_combinations, "
-                "expected: f{len(app_settings().collections())}, "
-                "got: f{combo_length}")
-
-        return combos
-
-    func_map = {
-        'product': product,
-        'combinations': combinations,
-        'permutations': permutations,
-        'specified': specified_combos
-    }
-
     def __init__(self,
                  repeat: int,
                  materials: list) -> None:
@@ -124,25 +128,18 @@ class VariableMaterialOverseer(MaterialOverseer):
 
         # retrieves all collections that are not material collections
         self._immaterial_collections = MaterialUtility.get_immaterial_collections()
-        function = self.func_map[app_settings().parameters().combinatorial_type()]
-        # compute the material combinations based on the method provided
-        self._material_combinations = list(function(
-            app_settings().material_combinations(),
+        # index the material combinations based on the method provided,
+        # each combination is computed when its state is applied
+        self._material_combinations = CombinationUtility.material_combinations(
             len(self._immaterial_collections)
-        ))
-        self._material_combo_index = 0
+        )
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the scene.
             This overseer sets the materials of meshes based on the combinations. """
 
-        if self._current_count < self._repeat:
-            self._current_count += 1
-            return
-
-        self._current_count = 0
-
-        material_combo = self._material_combinations[self._material_combo_index]
+        material_combo = self._material_combinations[state]
         for index in range(len(self._immaterial_collections)):
             collection = self._immaterial_collections[index]
             material_name = material_combo[index]
@@ -160,8 +157,27 @@ class VariableMaterialOverseer(MaterialOverseer):
                 meshes, self._materials_by_names[material_name]
             )
 
-        self._material_combo_index += 1
-        self._material_combo_index %= len(self._material_combinations)
+        self._state = state
+
+    def states_for_files(self,
+                         file_paths: list) -> list:
+        """ Returns the states whose combination uses a material loaded
+            from any of the provided files. """
+
+        names = {self._names[index] for index
+                 in self.material_indices_for_files(file_paths)}
+        if not names:
+            return list()
+
+        return [state for state, material_combo
+                in enumerate(self._material_combinations)
+                if names.intersection(material_combo)]
+
+    def state_for_combination(self,
+                              material_combo: tuple) -> int:
+        """ Returns the state that applies the provided combination. """
+
+        return self._material_combinations.index(material_combo)
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer. This is equivalent
@@ -169,15 +185,13 @@ class VariableMaterialOverseer(MaterialOverseer):
 
         return len(self._material_combinations)
 
-    def __str__(self):
-        current_index = self._material_combo_index - 1
-        current_index %= len(self._material_combinations)
-        accounted = set()
-        # we don't want to output the same material name twice, this handles duplicates
-        duplicates_removed = [component
-                              for component in self._material_combinations[current_index]
-                              if not (component in accounted or accounted.add(component))]
-        return '_'.join(duplicates_removed)
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        return CombinationUtility.combination_name(
+            self._material_combinations[state]
+        )
 
 
 def material_dispatcher(*args, **kwargs) -> MaterialOverseer:
@@ -2,10 +2,27 @@
     This is intended to be inherited.
 """
 
+from typing import Optional
+
+from src.trackers.time_tracker import time_tracker
+
 
 class Overseer:
     """ This class provides the default overseer. This is intended to be
-        inherited. """
+        inherited.
+
+        Each overseer is one digit of a mixed radix counter. The overseer's
+        state for an iteration is the iteration divided by the overseer's
+        repeat count, modulo its iteration count. This allows the overseer
+        to be moved directly to the state of any iteration. """
+
+    # the kind of axis this overseer forms in the render space
+    axis_kind = 'overseer'
+    # whether applying a state of this overseer replaces objects in the scene
+    modifies_scene = False
+    # whether a state of this overseer must be applied again after the
+    # objects in the scene have been replaced
+    depends_on_scene = False
 
     def __init__(self,
                  repeat: int) -> None:
@@ -14,13 +31,82 @@ class Overseer:
 
         self._repeat = max(repeat - 1, 0)
         self._current_count = self._repeat
+        self._stride = max(repeat, 1)
+        self._state = None
 
     def update(self) -> None:
         """ Updates this overseer and moves it forward to the next state. """
 
-        raise NotImplementedError("Overseer update must be implemented")
+        # only perform the update when required
+        if self._current_count < self._repeat:
+            self._current_count += 1
+            return
+
+        self._current_count = 0
+        self.apply_state(self.next_state())
+
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the scene. """
+
+        raise NotImplementedError("Overseer apply_state must be implemented")
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer. """
 
         raise NotImplementedError("Overseer iteration_count must be implemented")
+
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        raise NotImplementedError("Overseer component_for_state must be "
+                                  "implemented")
+
+    def axis_name(self) -> str:
+        """ Returns the name of the axis this overseer forms in the
+            render space. """
+
+        return self.axis_kind
+
+    def current_state(self) -> Optional[int]:
+        """ Returns the currently applied state, None if no state
+            has been applied yet. """
+
+        return self._state
+
+    def next_state(self) -> int:
+        """ Returns the state that follows the currently applied state. """
+
+        if self._state is None:
+            return 0
+
+        return (self._state + 1) % self.iteration_count()
+
+    def state_for_iteration(self,
+                            iteration: int) -> int:
+        """ Returns this overseer's state for the provided iteration. """
+
+        return (iteration // self._stride) % self.iteration_count()
+
+    def seek(self,
+             iteration: int,
+             force: bool = False) -> bool:
+        """ Moves this overseer directly to its state for the provided
+            iteration. The state is only applied when it differs from the
+            current state or when forced. Returns whether it was applied. """
+
+        state = self.state_for_iteration(iteration)
+        # align the repeat count so that update() continues from here
+        self._current_count = iteration % self._stride
+        if state == self._state and not force:
+            return False
+
+        time_tracker().start("transition", self.axis_name(),
+                             self.component_for_state(state))
+        self.apply_state(state)
+        time_tracker().end("transition", self.axis_name())
+        return True
+
+    def __str__(self):
+        return self.component_for_state(self._state)
@@ -0,0 +1,129 @@
+""" This module provides the scene mesh index to the app.
+"""
+
+from typing import Any
+
+from bpy import data
+
+from src.parsers.settings_parser import app_settings
+
+
+class SceneIndex:
+    """ This class maps each collection in the scene to its mesh objects.
+        The index is built once and then updated by the AppendUtility and
+        the ClearUtility as collections are loaded and cleared, so looking
+        up meshes does not walk every collection and object. """
+
+    def __init__(self) -> None:
+        # maps each collection name to its mesh objects, None until built
+        self._meshes = None
+
+    @staticmethod
+    def is_material_collection(name: str) -> bool:
+        """ Returns whether the provided collection is a material
+            collection. """
+
+        return name in app_settings().material_collection()
+
+    def build(self) -> None:
+        """ Indexes every local collection in the blend data. Linked
+            collections are only used through their overrides. """
+
+        self._meshes = dict()
+        for collection in data.collections:
+            if collection.library is None:
+                self.add(collection)
+
+    def built(self) -> dict:
+        """ Returns the index, building it on first use. """
+
+        if self._meshes is None:
+            self.build()
+
+        return self._meshes
+
+    def add(self,
+            collection: Any) -> None:
+        """ Indexes the provided collection and its child collections. """
+
+        if self._meshes is None:
+            # the collection is indexed when the index is built
+            return
+
+        self._meshes[collection.name] = {obj for obj in collection.all_objects
+                                         if obj.type == 'MESH'}
+        for child in collection.children:
+            self.add(child)
+
+    def remove(self,
+               name: str) -> None:
+        """ Removes the provided collection and its objects from the index.
+            Called before the collection's objects are removed. """
+
+        if self._meshes is None:
+            return
+
+        removed = self._meshes.pop(name, set())
+        if removed:
+            for meshes in self._meshes.values():
+                meshes -= removed
+
+    def rename(self,
+               name: str,
+               new_name: str) -> None:
+        """ Moves the provided collection's entry to its new name. """
+
+        if self._meshes is not None and name in self._meshes:
+            self._meshes[new_name] = self._meshes.pop(name)
+
+    def reset(self) -> None:
+        """ Drops the index, it is built again on next use. """
+
+        self._meshes = None
+
+    def meshes_in_collection(self,
+                             name: str) -> set:
+        """ Returns the mesh objects in the provided collection. """
+
+        return set(self.built().get(name, set()))
+
+    def scene_meshes(self,
+                     excluded_names: set) -> set:
+        """ Returns the mesh objects that are not in a material collection
+            or in one of the excluded collections, including their child
+            collections. """
+
+        meshes = set()
+        excluded_meshes = set()
+        for name, collection_meshes in self.built().items():
+            # each collection's meshes include those of its children
+            if SceneIndex.is_material_collection(name) \
+                    or name in excluded_names:
+                excluded_meshes.update(collection_meshes)
+            else:
+                meshes.update(collection_meshes)
+
+        return meshes - excluded_meshes
+
+    def material_meshes(self) -> set:
+        """ Returns the mesh objects in the material collections. """
+
+        meshes = set()
+        for name, collection_meshes in self.built().items():
+            if SceneIndex.is_material_collection(name):
+                meshes.update(collection_meshes)
+
+        return meshes
+
+
+_instance = None
+
+
+def scene_index() -> SceneIndex:
+    """ Singleton accessor for this class. """
+
+    global _instance
+    if _instance is None:
+        _instance = SceneIndex()
+
+    return _instance
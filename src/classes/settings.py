@@ -5,6 +5,9 @@
 from os import path, getcwd
 from typing import Optional
 
+from src.classes.exceptions import InvalidConfigurationException
+from src.classes.hdri_variants import HDRIVariants
+
 
 class AppSettings:
     """ This class is used to hold the app settings
@@ -19,7 +22,8 @@ class AppSettings:
                  blacklist: Optional[list] = None,
                  whitelist: Optional[list] = None,
                  orthographic_components: Optional[list] = None,
-                 material_combinations: Optional[list] = None) -> None:
+                 material_combinations: Optional[list] = None,
+                 collection_loaders: Optional[dict] = None) -> None:
         self._constants = constants
         self._collections = collections
         self._material_collection = material_collection
@@ -29,6 +33,7 @@ class AppSettings:
         self._whitelist = whitelist
         self._orthographic_components = orthographic_components
         self._material_combinations = material_combinations
+        self._collection_loaders = collection_loaders
 
     def collections(self) -> dict:
         """ Returns the collections specified in app settings. """
@@ -122,6 +127,35 @@ class AppSettings:
 
         return self._material_combinations
 
+    def collection_loader(self,
+                          collection: str) -> str:
+        """ Returns how the provided collection is loaded from its files
+            as specified in app settings, append by default. """
+
+        if self._collection_loaders is None:
+            return 'append'
+
+        loader = self._collection_loaders.get(collection, 'append')
+        if loader not in ['append', 'link']:
+            raise InvalidConfigurationException("Invalid collection loader: "
+                                                + str(loader))
+
+        return loader
+
+    def immaterial_collections(self) -> list:
+        """ Returns all collections that are not specified as the
+            material collection, ordered by priority. """
+
+        non_material_collections_by_priority = list()
+        for collection in sorted(self._collections.keys()):
+            if self._collections[collection] \
+                    not in self._material_collection:
+                non_material_collections_by_priority.append(
+                    self._collections[collection]
+                )
+
+        return non_material_collections_by_priority
+
     class Paths:
         """ This class is used to hold the path settings
             specified in app_settings.json. """
@@ -215,7 +249,15 @@ class AppSettings:
                      enable_time_tracking=False,
                      overwrite_all=False,
                      enable_material_combinations=False,
-                     combinatorial_type='product') -> None:
+                     combinatorial_type='product',
+                     traversal_order='odometer',
+                     resident_cache_mb=0,
+                     enable_datablock_report=False,
+                     sampling='none',
+                     sample_count=0,
+                     sample_seed=0,
+                     enable_material_dedup=False,
+                     enable_shader_warmup=False) -> None:
             self._enable_blacklist = enable_blacklist
             self._enable_whitelist = enable_whitelist
             self._enable_logging = enable_logging
@@ -225,6 +267,14 @@ class AppSettings:
             self._enable_material_combinations = \
                 enable_material_combinations
             self._combinatorial_type = combinatorial_type
+            self._traversal_order = traversal_order
+            self._resident_cache_mb = resident_cache_mb
+            self._enable_datablock_report = enable_datablock_report
+            self._sampling = sampling
+            self._sample_count = sample_count
+            self._sample_seed = sample_seed
+            self._enable_material_dedup = enable_material_dedup
+            self._enable_shader_warmup = enable_shader_warmup
 
         def blacklist_enabled(self) -> bool:
             """ Returns whether the blacklist is enabled in
@@ -274,6 +324,61 @@ class AppSettings:
 
             return self._combinatorial_type
 
+        def traversal_order(self) -> str:
+            """ Returns the order that the renders are traversed in as
+                specified in app settings parameters. """
+
+            return self._traversal_order
+
+        def resident_cache_mb(self) -> int:
+            """ Returns the memory budget in megabytes of the resident
+                collection cache as specified in app settings parameters,
+                0 disables the cache. """
+
+            return max(self._resident_cache_mb, 0)
+
+        def datablock_report_enabled(self) -> bool:
+            """ Returns whether the datablock counts are reported after
+                each render as specified in app settings parameters. """
+
+            return self._enable_datablock_report
+
+        def sampling_enabled(self) -> bool:
+            """ Returns whether a sample of the renders is rendered
+                as specified in app settings parameters. """
+
+            return self._sampling != 'none'
+
+        def sampling(self) -> str:
+            """ Returns the sampling method specified in app settings
+                parameters. """
+
+            return self._sampling
+
+        def sample_count(self) -> int:
+            """ Returns the number of renders sampled as specified in
+                app settings parameters. """
+
+            return max(self._sample_count, 0)
+
+        def sample_seed(self) -> int:
+            """ Returns the seed of the sample specified in app settings
+                parameters. """
+
+            return self._sample_seed
+
+        def material_dedup_enabled(self) -> bool:
+            """ Returns whether duplicate materials are merged as
+                specified in app settings parameters. """
+
+            return self._enable_material_dedup
+
+        def shader_warmup_enabled(self) -> bool:
+            """ Returns whether the shaders are compiled before rendering
+                as specified in app settings parameters. """
+
+            return self._enable_shader_warmup
+
 
 class BlenderSettings:
     """ This class is used to hold the blender settings
@@ -461,6 +566,22 @@ class BlenderSettings:
 
             return self._enable_exposure_variable_rendering
 
+        def exposures(self) -> list:
+            """ Returns each exposure value used by the exposure
+                variability, from the start exposure to the end exposure
+                in exposure steps. """
+
+            exposure_count = max(int((self._end_exposure
+                                      - self._start_exposure)
+                                     / self._exposure_step) + 1, 1)
+            exposures = list()
+            exposure = self._start_exposure
+            for index in range(exposure_count):
+                exposures.append(exposure)
+                exposure += self._exposure_step
+
+            return exposures
+
     class SceneSettings:
         """ This class is used to hold the scene settings
             specified in blender_settings.json. """
@@ -593,7 +714,11 @@ class BlenderSettings:
                      enable_emission_variability=False,
                      enable_hdri=False,
                      hdri_dir='',
-                     hdris: list = None) -> None:
+                     hdris: list = None,
+                     hdri_cache_mb: int = 1024,
+                     hdri_variant_width: int = 0,
+                     hdri_half_float=False,
+                     hdri_variant_dir='hdri_variants') -> None:
             self._default_emission = default_emission
             self._emission_step = emission_step
             self._max_emission = max_emission
@@ -603,6 +728,11 @@ class BlenderSettings:
             self._use_hdri = enable_hdri
             self._hdri_dir = hdri_dir
             self._hdris = hdris
+            self._hdri_cache_mb = hdri_cache_mb
+            self._hdri_variant_width = hdri_variant_width
+            self._hdri_half_float = hdri_half_float
+            self._hdri_variant_dir = hdri_variant_dir
+            self._hdri_variants = None
 
         def default_emission(self) -> float:
             """ Returns the default emission as specified in
@@ -634,6 +764,21 @@ class BlenderSettings:
 
             return self._enable_emission_variable_rendering
 
+        def emissions(self) -> list:
+            """ Returns each emission value used by the emission
+                variability, from the emission step to the max emission
+                in emission steps. """
+
+            emission_count = max(int(self._max_emission
+                                     / self._emission_step), 1)
+            emissions = list()
+            emission = self._emission_step
+            for index in range(emission_count):
+                emissions.append(emission)
+                emission += self._emission_step
+
+            return emissions
+
         def hdri_enabled(self) -> bool:
             """ Returns whether hdris are enabled as specified in
                 background settings. """
@@ -646,7 +791,7 @@ class BlenderSettings:
 
             return self._hdri_dir
 
-        def hdris(self) -> list:
+        def hdri_source_paths(self) -> list:
             """ Returns the paths to all of the hdris
                 as specified in background settings. """
 
@@ -657,6 +802,236 @@ class BlenderSettings:
 
             return hdri_paths
 
+        def hdris(self) -> list:
+            """ Returns the paths to all of the hdris to load, each hdri
+                resolves to its variant for the variant width when the
+                variant is available. The file names are unchanged. """
+
+            if self._hdri_variants is None:
+                self._hdri_variants = HDRIVariants(self.hdri_variant_dir())
+
+            return [self._hdri_variants.resolve(hdri_path,
+                                                self.hdri_variant_width(),
+                                                self.hdri_half_float())
+                    for hdri_path in self.hdri_source_paths()]
+
+        def hdri_cache_mb(self) -> int:
+            """ Returns the memory budget in megabytes of the loaded
+                hdri images as specified in background settings. """
+
+            return max(self._hdri_cache_mb, 0)
+
+        def hdri_variant_width(self) -> int:
+            """ Returns the width the hdris are downsampled to as
+                specified in background settings, 0 loads the hdris. """
+
+            return max(self._hdri_variant_width, 0)
+
+        def hdri_half_float(self) -> bool:
+            """ Returns whether the hdri variants are stored as half
+                float as specified in background settings. """
+
+            return self._hdri_half_float
+
+        def hdri_variant_dir(self) -> str:
+            """ Returns the hdri variants directory path as specified in
+                background settings. """
+
+            return path.join(getcwd(), self._hdri_variant_dir)
+
+
+class RunSettings:
+    """ This class is used to hold the run settings
+        specified on the command line. """
+
+    def __init__(self,
+                 workers: int = 1,
+                 shard_index: int = 0,
+                 shard_count: int = 1,
+                 resume: bool = False,
+                 iterations: Optional[str] = None,
+                 pool: bool = False,
+                 serve: Optional[str] = None,
+                 idle_timeout: int = 1800,
+                 shutdown_pool: bool = False,
+                 coordinator: Optional[str] = None,
+                 render_timeout: float = 0,
+                 max_restarts: int = 3,
+                 index: bool = False,
+                 slim: bool = False,
+                 unpack_images: bool = False,
+                 hdri_variants: bool = False,
+                 watch: bool = False,
+                 poll_seconds: float = 30) -> None:
+        self._workers = workers
+        self._shard_index = shard_index
+        self._shard_count = shard_count
+        self._resume = resume
+        self._iterations = iterations
+        self._pool = pool
+        self._serve = serve
+        self._idle_timeout = idle_timeout
+        self._shutdown_pool = shutdown_pool
+        self._coordinator = coordinator
+        self._render_timeout = render_timeout
+        self._max_restarts = max_restarts
+        self._index = index
+        self._slim = slim
+        self._unpack_images = unpack_images
+        self._hdri_variants = hdri_variants
+        self._watch = watch
+        self._poll_seconds = poll_seconds
+
+    def workers(self) -> int:
+        """ Returns the number of Blender processes to launch as
+            specified in run settings. """
+
+        return max(self._workers, 1)
+
+    def shard_index(self) -> int:
+        """ Returns the shard rendered by this Blender process as
+            specified in run settings. """
+
+        return self._shard_index
+
+    def shard_count(self) -> int:
+        """ Returns the total number of shards as specified in
+            run settings. """
+
+        return max(self._shard_count, 1)
+
+    def sharded(self) -> bool:
+        """ Returns whether this Blender process only renders a
+            shard of the render space. """
+
+        return self.shard_count() > 1
+
+    def resume(self) -> bool:
+        """ Returns whether the run resumes from the render journal
+            as specified in run settings. """
+
+        return self._resume
+
+    def iteration_ranges(self) -> Optional[list]:
+        """ Returns the (start, end) iteration ranges to render as
+            specified in run settings, the end is exclusive. Returns None
+            when every iteration is rendered. """
+
+        if self._iterations is None:
+            return None
+
+        iteration_ranges = list()
+        for iteration_range in self._iterations.split(","):
+            bounds = iteration_range.split(":")
+            if len(bounds) != 2 or not all(bound.strip().isdigit()
+                                           for bound in bounds):
+                raise InvalidConfigurationException("Invalid iteration "
+                                                    "range: "
+                                                    + iteration_range)
+
+            iteration_ranges.append((int(bounds[0]), int(bounds[1])))
+
+        return iteration_ranges
+
+    def pool(self) -> bool:
+        """ Returns whether the renders are submitted to the persistent
+            worker pool as specified in run settings. """
+
+        return self._pool
+
+    def serve(self) -> Optional[str]:
+        """ Returns the socket this Blender process serves render jobs on
+            as a persistent worker, None when it renders a single run. """
+
+        return self._serve
+
+    def idle_timeout(self) -> int:
+        """ Returns the number of seconds a persistent worker waits for a
+            job before exiting, 0 waits forever. """
+
+        return max(self._idle_timeout, 0)
+
+    def shutdown_pool(self) -> bool:
+        """ Returns whether the idle persistent workers are shut down as
+            specified in run settings. """
+
+        return self._shutdown_pool
+
+    def coordinator(self) -> Optional[str]:
+        """ Returns the HOST:PORT address of the coordinator this Blender
+            process leases its renders from, None when it renders its own
+            plan. """
+
+        return self._coordinator
+
+    def render_timeout(self) -> float:
+        """ Returns the number of seconds a Blender process may take for
+            a single render before it is restarted, 0 disables the timeout. """
+
+        return max(self._render_timeout, 0)
+
+    def max_restarts(self) -> int:
+        """ Returns the number of times a crashed or hung Blender process
+            is restarted as specified in run settings. """
+
+        return max(self._max_restarts, 0)
+
+    def index(self) -> bool:
+        """ Returns whether the asset index is updated instead of
+            rendering as specified in run settings. """
+
+        return self._index
+
+    def slim(self) -> bool:
+        """ Returns whether the slim asset cache is written instead of
+            rendering as specified in run settings. """
+
+        return self._slim
+
+    def unpack_images(self) -> bool:
+        """ Returns whether the packed images of the slimmed files are
+            unpacked as specified in run settings. """
+
+        return self._unpack_images
+
+    def hdri_variants(self) -> bool:
+        """ Returns whether the hdri variants are written instead of
+            rendering as specified in run settings. """
+
+        return self._hdri_variants
+
+    def watch(self) -> bool:
+        """ Returns whether the collection directories are watched and
+            new renders submitted to the worker pool as specified in run
+            settings. """
+
+        return self._watch
+
+    def poll_seconds(self) -> float:
+        """ Returns the number of seconds between each poll of the
+            collection directories when inotify is unavailable. """
+
+        return max(self._poll_seconds, 1)
+
+    def driver_arguments(self,
+                         shard_index: int = 0,
+                         shard_count: int = 1) -> list:
+        """ Returns the command line arguments that are forwarded to a
+            Blender process rendering the provided shard. """
+
+        arguments = list()
+        if shard_count > 1:
+            arguments.extend(["--shard-index", str(shard_index),
+                              "--shard-count", str(shard_count)])
+        if self._resume:
+            arguments.append("--resume")
+        if self._iterations is not None:
+            arguments.extend(["--iterations", self._iterations])
+        if self._coordinator is not None:
+            arguments.extend(["--coordinator", self._coordinator])
+
+        return arguments
+
 
 class TypeSettings:
     """ This class is used to hold the type settings
@@ -0,0 +1,208 @@
+""" This module contains the Blender process supervisor. The supervisor
+    reports the progress of the Blender processes and restarts them when
+    they crash or hang.
+"""
+
+from asyncio import create_subprocess_exec, gather, TimeoutError, wait_for
+from asyncio.subprocess import PIPE, STDOUT
+from re import compile
+from sys import stdout
+from time import gmtime, monotonic, strftime
+from typing import Callable, Optional
+
+
+class Supervisor:
+    """ This class streams the output of each Blender process. The render
+        lines logged by the OverseerUtility are parsed to report the
+        throughput and the estimated time remaining. A process that exits
+        with an error, or takes longer than the render timeout between two
+        renders, is restarted from the render journal with --resume. """
+
+    RENDER_PATTERN = compile(r"Render (\d+) out of (\d+)")
+    # Blender can write long lines, e.g. when reporting a python exception
+    LINE_LIMIT = 1 << 20
+
+    class Process:
+        """ This class is used to hold the state of a supervised Blender
+            process. """
+
+        def __init__(self,
+                     name: str,
+                     command: list) -> None:
+            self._name = name
+            self._command = command
+            self._count = 0
+            self._total = 0
+            self._restarts = 0
+            self._last_render = None
+
+        def name(self) -> str:
+            """ Returns the name of this process. """
+
+            return self._name
+
+        def command(self) -> list:
+            """ Returns the command executing this process, a restarted
+                process resumes from its render journal. """
+
+            if self._restarts > 0 and "--resume" not in self._command:
+                return self._command + ["--resume"]
+
+            return self._command
+
+        def count(self) -> int:
+            """ Returns the last reported render number. """
+
+            return self._count
+
+        def total(self) -> int:
+            """ Returns the reported number of renders. """
+
+            return self._total
+
+        def restarts(self) -> int:
+            """ Returns the number of times this process was restarted. """
+
+            return self._restarts
+
+        def last_render(self) -> Optional[float]:
+            """ Returns the time of the last render line, None before the
+                first render of the current execution. """
+
+            return self._last_render
+
+        def update(self,
+                   count: int,
+                   total: int,
+                   now: float) -> None:
+            """ Records a render line. """
+
+            self._count = count
+            self._total = total
+            self._last_render = now
+
+        def restart(self) -> None:
+            """ Records a restart of this process. """
+
+            self._restarts += 1
+            self._last_render = None
+
+    def __init__(self,
+                 commands: list,
+                 render_timeout: float = 0,
+                 max_restarts: int = 3,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self._processes = [Supervisor.Process('worker ' + str(index), command)
+                           for index, command in enumerate(commands)]
+        self._render_timeout = render_timeout
+        self._max_restarts = max_restarts
+        self._clock = clock
+        self._start = None
+        self._start_count = 0
+
+    def count(self) -> int:
+        """ Returns the renders reported by all processes. """
+
+        return sum(process.count() for process in self._processes)
+
+    def total(self) -> int:
+        """ Returns the number of renders reported by all processes. """
+
+        return sum(process.total() for process in self._processes)
+
+    def progress(self) -> str:
+        """ Returns the progress, throughput and estimated time remaining
+            of all processes. """
+
+        now = self._clock()
+        count = self.count()
+        progress = "Progress: " + str(count) + " out of " \
+                   + str(self.total()) + " renders"
+        # the throughput is measured from the first reported render
+        if self._start is None:
+            self._start = now
+            self._start_count = count
+        elapsed = now - self._start
+        if elapsed <= 0 or count <= self._start_count:
+            return progress
+
+        throughput = (count - self._start_count) / elapsed
+        remaining = max(self.total() - count, 0) / throughput
+        return progress + ", " + "{0:.2f}".format(throughput * 60) \
+            + " renders/min, ETA " + strftime("%H:%M:%S", gmtime(remaining))
+
+    def timeout(self,
+                process: 'Supervisor.Process') -> Optional[float]:
+        """ Returns the seconds left before the process' current render
+            times out, None when renders do not time out. """
+
+        if self._render_timeout <= 0 or process.last_render() is None:
+            return None
+
+        return max(self._render_timeout
+                   - (self._clock() - process.last_render()), 0)
+
+    def parse(self,
+              process: 'Supervisor.Process',
+              line: str) -> None:
+        """ Echoes a line of output and records the render lines. """
+
+        stdout.write(line)
+        match = Supervisor.RENDER_PATTERN.search(line)
+        if match is not None:
+            process.update(int(match.group(1)), int(match.group(2)),
+                           self._clock())
+            stdout.write(self.progress() + "\n")
+
+        stdout.flush()
+
+    async def execute(self,
+                      process: 'Supervisor.Process') -> bool:
+        """ Executes the process once. Returns whether it succeeded. """
+
+        subprocess = await create_subprocess_exec(*process.command(),
+                                                  stdout=PIPE, stderr=STDOUT,
+                                                  limit=Supervisor.LINE_LIMIT)
+        while True:
+            try:
+                line = await wait_for(subprocess.stdout.readline(),
+                                      self.timeout(process))
+            except TimeoutError:
+                stdout.write(process.name() + ": render timed out after "
+                             + str(self._render_timeout) + " seconds\n")
+                subprocess.kill()
+                await subprocess.wait()
+                return False
+
+            if not line:
+                break
+
+            self.parse(process, line.decode(errors="replace"))
+
+        return await subprocess.wait() == 0
+
+    async def monitor(self,
+                      process: 'Supervisor.Process') -> bool:
+        """ Executes the process, restarting it until it succeeds or runs
+            out of restarts. Returns whether it succeeded. """
+
+        while not await self.execute(process):
+            if process.restarts() >= self._max_restarts:
+                stdout.write(process.name() + ": failed after "
+                             + str(process.restarts()) + " restarts\n")
+                return False
+
+            process.restart()
+            stdout.write(process.name() + ": restarting from the render "
+                         "journal, restart " + str(process.restarts())
+                         + " out of " + str(self._max_restarts) + "\n")
+
+        return True
+
+    async def supervise(self) -> int:
+        """ Executes all processes at the same time and waits for all of
+            them to finish. Returns the number of processes that failed. """
+
+        results = await gather(*[self.monitor(process)
+                                 for process in self._processes])
+        return results.count(False)
@@ -6,18 +6,22 @@ from bpy import context
 
 from src.classes.overseer import Overseer
 from src.parsers.settings_parser import blender_settings
+from src.utilities.output_utility import OutputUtility
 
 
 class ViewOverseer(Overseer):
     """ This class provides the generic view overseer class.
         This is intended to be inherited. """
 
+    axis_kind = 'view'
+
     def __init__(self,
                  repeat: int) -> None:
         super(ViewOverseer, self).__init__(repeat)
 
-    def update(self) -> None:
-        raise NotImplementedError("ViewOverseer update must "
+    def apply_state(self,
+                    state: int) -> None:
+        raise NotImplementedError("ViewOverseer apply_state must "
                                   "be implemented")
 
     def iteration_count(self) -> int:
@@ -33,13 +37,14 @@ class DefaultExposureOverseer(ViewOverseer):
                  repeat: int) -> None:
         super(DefaultExposureOverseer, self).__init__(repeat)
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next
-            state. This overseer simply sets the world's exposure to
-            the default. """
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the scene. This overseer
+            simply sets the world's exposure to the default. """
 
         context.scene.view_settings.exposure = \
             blender_settings().view_settings().default_exposure()
+        self._state = state
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer. The iteration
@@ -48,9 +53,13 @@ class DefaultExposureOverseer(ViewOverseer):
 
         return 1
 
-    def __str__(self):
-        return 'exp' + \
-               str(blender_settings().view_settings().default_exposure())
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        return OutputUtility.exposure_component(
+            blender_settings().view_settings().default_exposure()
+        )
 
 
 class VariableExposureOverseer(ViewOverseer):
@@ -61,41 +70,29 @@ class VariableExposureOverseer(ViewOverseer):
     def __init__(self,
                  repeat: int) -> None:
         super(VariableExposureOverseer, self).__init__(repeat)
-        self._current_exposure = \
-            blender_settings().view_settings().start_exposure() - \
-            blender_settings().view_settings().exposure_step()
+        self._exposures = blender_settings().view_settings().exposures()
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
-            This overseer sets the world's emission based on the emission
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the scene.
+            This overseer sets the world's exposure based on the exposure
             variability conditions. """
 
-        # only perform updates when required
-        if self._current_count < self._repeat:
-            self._current_count += 1
-            return
-
-        view_settings = blender_settings().view_settings()
-        self._current_exposure += view_settings.exposure_step()
-        # update the exposure based on the exposure step
-        if self._current_exposure > view_settings.end_exposure():
-            self._current_exposure = view_settings.start_exposure()
-
-        self._current_count = 0
-        context.scene.view_settings.exposure = self._current_exposure
+        context.scene.view_settings.exposure = self._exposures[state]
+        self._state = state
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer.
             This is equivalent to the number of iterations it takes
             to utilize each exposure value. """
 
-        view_settings = blender_settings().view_settings()
-        return max(int((view_settings.end_exposure()
-                   - view_settings.start_exposure())
-                       / view_settings.exposure_step()) + 1, 1)
+        return len(self._exposures)
+
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
 
-    def __str__(self):
-        return 'exp' + str(self._current_exposure)
+        return OutputUtility.exposure_component(self._exposures[state])
 
 
 def view_dispatcher(*args, **kwargs) -> ViewOverseer:
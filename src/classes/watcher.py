@@ -0,0 +1,118 @@
+""" This module contains the directory watcher. The watcher wakes the app
+    when files are added to or changed in the collection directories.
+"""
+
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import close, path, read, strerror
+from select import select
+from time import sleep
+from typing import Optional
+
+from src.trackers.logger import logger
+
+
+class Watcher:
+    """ This class waits for changes to the provided directories. Linux
+        inotify is used through ctypes when available, otherwise the
+        directories are polled. """
+
+    # inotify_init1 flags
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    # inotify events for files that are written, moved or deleted
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self,
+                 directories: list,
+                 poll_seconds: float = 30) -> None:
+        self._poll_seconds = poll_seconds
+        self._fd = None
+        try:
+            self._fd = Watcher.inotify(directories)
+        except (AttributeError, OSError) as e:
+            logger().info("Polling every " + str(poll_seconds)
+                          + " seconds, inotify is unavailable: " + str(e))
+
+    @staticmethod
+    def inotify(directories: list) -> int:
+        """ Returns an inotify file descriptor watching the directories. """
+
+        libc = CDLL(find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(Watcher.IN_NONBLOCK | Watcher.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(get_errno(), strerror(get_errno()))
+
+        mask = Watcher.IN_CLOSE_WRITE | Watcher.IN_MOVED_FROM \
+            | Watcher.IN_MOVED_TO | Watcher.IN_CREATE | Watcher.IN_DELETE
+        for directory in directories:
+            if libc.inotify_add_watch(fd, path.abspath(directory).encode(),
+                                      mask) < 0:
+                close(fd)
+                raise OSError(get_errno(), strerror(get_errno()))
+
+        return fd
+
+    @staticmethod
+    def snapshot(files: dict) -> dict:
+        """ Returns the (modified time, size) of each of the provided files,
+            by collection. Files removed while listing are left out. """
+
+        snapshot = dict()
+        for collection, file_list in files.items():
+            snapshot[collection] = dict()
+            for file_path in file_list:
+                try:
+                    snapshot[collection][file_path] = \
+                        (path.getmtime(file_path), path.getsize(file_path))
+                except OSError:
+                    continue
+
+        return snapshot
+
+    @staticmethod
+    def changed_files(previous: dict,
+                      current: dict) -> dict:
+        """ Returns the files, by collection, that were added or modified
+            between the provided snapshots. """
+
+        return {collection: [file_path for file_path, file_stat
+                             in file_stats.items()
+                             if previous.get(collection, dict())
+                             .get(file_path) != file_stat]
+                for collection, file_stats in current.items()}
+
+    def notifying(self) -> bool:
+        """ Returns whether changes are notified rather than polled. """
+
+        return self._fd is not None
+
+    def wait(self,
+             timeout: Optional[float] = None) -> None:
+        """ Waits until the directories may have changed. Polling waits for
+            the poll interval, inotify waits for the next events or the
+            timeout. """
+
+        if not self.notifying():
+            sleep(self._poll_seconds)
+            return
+
+        readable, _, _ = select([self._fd], [], [], timeout)
+        # the events only wake the watcher, the directories are compared
+        # by the caller, so drain them
+        while readable:
+            try:
+                read(self._fd, 65536)
+            except BlockingIOError:
+                break
+
+    def close(self) -> None:
+        """ Stops watching the directories. """
+
+        if self._fd is not None:
+            close(self._fd)
+            self._fd = None
@@ -2,9 +2,11 @@
 """
 
 from bpy import context, data
+from collections import OrderedDict
 from typing import Any
 
 from src.parsers.settings_parser import blender_settings
+from src.trackers.stat_tracker import stat_tracker
 
 
 # noinspection SpellCheckingInspection
@@ -12,8 +14,18 @@ class World:
     """ This class provides a world object that retains reference
         to the scene's world and provides helpful world operations. """
 
+    # name of the environment node that displays the hdris
+    ENVIRONMENT_NODE = 'hdri_environment'
+
     def __init__(self) -> None:
         self._world_scene = context.scene.world
+        # maps each hdri path to its image name, ordered from the least to
+        # the most recently used
+        self._hdri_images = OrderedDict()
+        self._hdri_memory = dict()
+        self._hdri_budget = \
+            blender_settings().background_settings().hdri_cache_mb() \
+            * 1024 * 1024
 
     def scene(self) -> Any:
         """ Returns this world's scene. """
@@ -34,29 +46,90 @@ class World:
                     background_settings.emission_color()
                 node.inputs['Strength'].default_value = emission_value
 
-    def set_hdri(self,
-                 hdri_path: str) -> None:
-        """ Sets this world's hdri. """
+    def environment_node(self) -> Any:
+        """ Returns this world's environment node, creating it and linking
+            it to the background the first time. """
 
-        # creates the new hdri node
-        node_env = \
-            self._world_scene.node_tree.nodes.new('ShaderNodeTexEnvironment')
-        node_env.image = data.images.load(hdri_path)
+        nodes = self._world_scene.node_tree.nodes
+        node_env = nodes.get(World.ENVIRONMENT_NODE)
+        if node_env is not None:
+            return node_env
+
+        # creates the hdri node
+        node_env = nodes.new('ShaderNodeTexEnvironment')
+        node_env.name = World.ENVIRONMENT_NODE
         node_env.location = -300, 0
 
-        node_background = None
         # find the appropriate background node
+        for node in nodes:
+            if node.type == 'BACKGROUND':
+                # link the hdri node to the background
+                self._world_scene.node_tree.links.new(
+                    node_env.outputs['Color'],
+                    node.inputs['Color']
+                )
+
+        return node_env
+
+    @staticmethod
+    def estimate_memory(image: Any) -> int:
+        """ Returns the estimated memory in bytes of the provided image. """
+
+        channel_bytes = 4 if image.is_float else 1
+        return image.size[0] * image.size[1] * image.channels * channel_bytes
+
+    def hdri_image(self,
+                   hdri_path: str) -> Any:
+        """ Returns the image of the provided hdri, loading it when it is
+            not cached. The images are kept with a fake user so they are
+            not purged while unused. """
+
+        name = self._hdri_images.get(hdri_path)
+        image = data.images.get(name) if name is not None else None
+        if image is not None:
+            self._hdri_images.move_to_end(hdri_path)
+            stat_tracker().update_stat("hdri_hit")
+            return image
+
+        image = data.images.load(hdri_path, check_existing=True)
+        image.use_fake_user = True
+        self._hdri_images[hdri_path] = image.name
+        self._hdri_memory[hdri_path] = World.estimate_memory(image)
+        stat_tracker().update_stat("hdri_load")
+        return image
+
+    def evict_hdris(self,
+                    current_path: str) -> None:
+        """ Removes the least recently used hdri images until the estimated
+            memory is within the budget. The current hdri is kept. """
+
+        for hdri_path in list(self._hdri_images):
+            if sum(self._hdri_memory.values()) <= self._hdri_budget:
+                break
+            if hdri_path == current_path:
+                continue
+
+            image = data.images.get(self._hdri_images.pop(hdri_path))
+            del self._hdri_memory[hdri_path]
+            if image is not None:
+                data.images.remove(image)
+            stat_tracker().update_stat("hdri_evict")
+
+    def set_hdri(self,
+                 hdri_path: str) -> None:
+        """ Sets this world's hdri. The environment node is reused and only
+            its image is swapped, each hdri image is only loaded once while
+            it fits in the hdri memory budget. """
+
+        node_env = self.environment_node()
+        image = self.hdri_image(hdri_path)
+        if node_env.image != image:
+            node_env.image = image
+        self.evict_hdris(hdri_path)
+
         for node in self._world_scene.node_tree.nodes:
             if node.type == 'BACKGROUND':
                 node.inputs['Strength'].default_value = 1.0
-                node_background = node
-
-        if node_background is not None:
-            # link the hdri node to the background
-            self._world_scene.node_tree.links.new(
-                node_env.outputs['Color'],
-                node_background.inputs['Color']
-            )
 
 
 _instance = None
@@ -2,25 +2,27 @@
     This provides a simple interface for selecting the correct type.
 """
 
-from os import path
-
 from src.classes.exceptions import InvalidHDRIException
 from src.classes.overseer import Overseer
 from src.classes.world import world
 from src.parsers.settings_parser import blender_settings
+from src.utilities.output_utility import OutputUtility
 
 
 class WorldOverseer(Overseer):
     """ This class provides the generic world overseer class.
         This is intended to be inherited. """
 
+    axis_kind = 'world'
+
     def __init__(self,
                  repeat: int) -> None:
         super(WorldOverseer, self).__init__(repeat)
         self._world = world()
 
-    def update(self) -> None:
-        raise NotImplementedError("WorldOverseer update "
+    def apply_state(self,
+                    state: int) -> None:
+        raise NotImplementedError("WorldOverseer apply_state "
                                   "must be implemented")
 
     def iteration_count(self) -> int:
@@ -36,13 +38,15 @@ class DefaultEmissionOverseer(WorldOverseer):
                  repeat: int) -> None:
         super(DefaultEmissionOverseer, self).__init__(repeat)
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the world.
             This overseer simply sets the world's emission to the default. """
 
         world().set_background_emission(
             blender_settings().background_settings().default_emission()
         )
+        self._state = state
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer.
@@ -51,9 +55,13 @@ class DefaultEmissionOverseer(WorldOverseer):
 
         return 1
 
-    def __str__(self):
-        return 'em' + \
-               str(blender_settings().background_settings().default_emission())
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        return OutputUtility.emission_component(
+            blender_settings().background_settings().default_emission()
+        )
 
 
 class VariableEmissionOverseer(WorldOverseer):
@@ -64,39 +72,31 @@ class VariableEmissionOverseer(WorldOverseer):
     def __init__(self,
                  repeat: int) -> None:
         super(VariableEmissionOverseer, self).__init__(repeat)
-        self._current_emission = 0.0
+        self._emissions = \
+            blender_settings().background_settings().emissions()
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the world.
             This overseer sets the world's emission based on the emission
             variability conditions. """
 
-        # only perform updates when required
-        if self._current_count < self._repeat:
-            self._current_count += 1
-            return
-
-        background_settings = blender_settings().background_settings()
-        self._current_emission += background_settings.emission_step()
-        # update the emission based on the emission step
-        if self._current_emission > background_settings.max_emission():
-            self._current_emission = background_settings.emission_step()
-
-        self._current_count = 0
         # use the world object to set the emission
-        world().set_background_emission(self._current_emission)
+        world().set_background_emission(self._emissions[state])
+        self._state = state
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer.
             This is equivalent to the number of iterations it takes to
             utilize each emission value. """
 
-        background_settings = blender_settings().background_settings()
-        return max(int(background_settings.max_emission()
-                       / background_settings.emission_step()), 1)
+        return len(self._emissions)
+
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
 
-    def __str__(self):
-        return 'em' + str(self._current_emission)
+        return OutputUtility.emission_component(self._emissions[state])
 
 
 class HDRIOverseer(WorldOverseer):
@@ -108,31 +108,24 @@ class HDRIOverseer(WorldOverseer):
                  repeat: int) -> None:
         super(HDRIOverseer, self).__init__(repeat)
         self._hdris = blender_settings().background_settings().hdris()
-        self._hdri_index = 0
 
-    def update(self) -> None:
-        """ Updates this overseer and moves it forward to the next state.
-            This overseer sets the world's hdri in order. """
+    def apply_state(self,
+                    state: int) -> None:
+        """ Applies the provided state to the world.
+            This overseer sets the world's hdri for the state. """
 
         # ensure that we are using a valid hdri
-        if self._hdri_index >= len(self._hdris):
+        if state >= len(self._hdris):
             raise InvalidHDRIException("Hit an hdri index that "
                                        "is out of the valid range: "
-                                       + str(self._hdri_index)
+                                       + str(state)
                                        + ", max: "
                                        + str(len(self._hdris))
                                        + ", for hdris")
 
-        # only perform the update when required
-        if self._current_count < self._repeat:
-            self._current_count += 1
-            return
-
-        self._current_count = 0
         # use the world object to set the hdri
-        world().set_hdri(self._hdris[self._hdri_index])
-        self._hdri_index += 1
-        self._hdri_index %= len(self._hdris)
+        world().set_hdri(self._hdris[state])
+        self._state = state
 
     def iteration_count(self) -> int:
         """ Returns the iteration count for this overseer.
@@ -140,11 +133,11 @@ class HDRIOverseer(WorldOverseer):
 
         return len(self._hdris)
 
-    def __str__(self):
-        # the current hdri is always one before the index tracker
-        current_hdri_index = self._hdri_index - 1
-        current_hdri_index %= len(self._hdris)
-        return str(path.split(self._hdris[current_hdri_index])[-1])
+    def component_for_state(self,
+                            state: int) -> str:
+        """ Returns the file name component for the provided state. """
+
+        return OutputUtility.hdri_component(self._hdris[state])
 
 
 def world_dispatcher(*args, **kwargs) -> WorldOverseer:
@@ -0,0 +1,68 @@
+""" This module writes the hdri variants cache and exits Blender on
+    completion.
+"""
+
+from os import path
+from sys import argv, exit
+
+
+from src.classes.hdri_variants import HDRIVariants
+from src.parsers.settings_parser import app_settings, blender_settings, \
+    run_settings, type_settings
+from src.trackers.logger import logger
+from src.utilities.hdri_utility import HDRIUtility
+
+
+class Downsampler:
+    """ This class writes the variant of each hdri that changed since its
+        variant was written. """
+
+    @staticmethod
+    def downsample() -> None:
+        """ Writes the missing hdri variants for the target width and
+            precision specified in the background settings. """
+
+        logger().info(" >>>>>>>>>>>>> Downsampler Running <<<<<<<<<<<<<")
+        background_settings = blender_settings().background_settings()
+        width = background_settings.hdri_variant_width()
+        half_float = background_settings.hdri_half_float()
+        variants = HDRIVariants(background_settings.hdri_variant_dir())
+        hdri_paths = list()
+        if width > 0:
+            hdri_paths = [hdri_path for hdri_path
+                          in background_settings.hdri_source_paths()
+                          if hdri_path.lower().endswith(HDRIVariants.EXTENSION)
+                          and variants.variant(hdri_path, width,
+                                               half_float) is None]
+        else:
+            logger().info("No hdri variant width specified")
+
+        for index, hdri_path in enumerate(hdri_paths):
+            logger().info("Downsample " + str(index + 1) + " out of "
+                          + str(len(hdri_paths)) + ": " + hdri_path)
+            digest = HDRIVariants.source_hash(hdri_path)
+            variant_path = variants.variant_path(hdri_path, digest, width,
+                                                 half_float)
+            # hdris with the same contents share a variant
+            if not path.isfile(variant_path):
+                HDRIUtility.write_variant(hdri_path, variant_path, width,
+                                          half_float)
+            variants.record(hdri_path, digest)
+            # keep the written variants when downsampling is interrupted
+            variants.save()
+
+        logger().info("Downsampled " + str(len(hdri_paths)) + " hdris")
+        logger().info(" >>>>>>>>>>>>> Downsampler Complete <<<<<<<<<<<<<")
+
+
+if __name__ == "__main__":
+    """ Entry point into the downsampler. Calls into the
+        settings parsers and executes the downsampler. """
+    settings_paths = argv[argv.index("--") + 1:]
+    app_settings(settings_paths[0])
+    blender_settings(settings_paths[1])
+    type_settings(settings_paths[2])
+    run_settings(settings_paths[3:])
+    Downsampler.downsample()
+    # call exit to kill Blender process
+    exit()
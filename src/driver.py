@@ -1,70 +1,311 @@
 """ This module handles the core app and exits Blender on completion.
 """
 
+from fcntl import flock, LOCK_EX, LOCK_UN
+from os import getpid, path, remove
+from socket import AF_UNIX, SOCK_STREAM, gethostname, socket, timeout
 from sys import argv, exit
-
+from time import sleep
+from typing import Optional
 
 from src.classes.camera import camera
+from src.classes.coordinator import Coordinator
 from src.parsers.directory_parser import parse_directories
 from src.parsers.settings_parser import app_settings, blender_settings, \
-    type_settings
+    run_settings, type_settings
+from src.trackers.cost_history import cost_history
 from src.trackers.logger import logger
+from src.trackers.render_journal import render_journal
 from src.trackers.stat_tracker import stat_tracker
 from src.trackers.time_tracker import time_tracker
 from src.utilities.clear_utility import ClearUtility
 from src.utilities.material_utility import MaterialUtility
+from src.utilities.output_utility import OutputUtility
 from src.utilities.overseer_utility import OverseerUtility
+from src.utilities.render_utility import RenderUtility
 from src.utilities.settings_utility import SettingsUtility
+from src.utilities.shard_utility import ShardUtility
+from src.utilities.worker_utility import WorkerUtility
 
 
 class Driver:
     """ This class performs the core app code and loop. """
 
     @staticmethod
-    def process(files: dict) -> None:
+    def process(files: dict,
+                materials: Optional[list] = None,
+                iteration_ranges: Optional[list] = None,
+                changed_files: Optional[list] = None,
+                shard: Optional[tuple] = None) -> int:
         """ Handles each of the files provided. This function
-            calls into the overseers and executes the main loop. """
+            calls into the overseers and executes the main loop.
+            The materials are loaded unless provided, only the iterations
+            within the provided ranges are rendered when provided. When
+            changed files are provided, only the iterations using them are
+            rendered, whether or not their output exists. The shard is the
+            (start, count) of the files' outermost files, if sharded.
+            Returns the number of renders executed. """
+
+        # a persistent worker processes many jobs, and the output
+        # directory may change between them
+        OutputUtility.clear()
 
         # pass the files and material information to the utility
         # this performs all parsing necessary to determine what
         # will be rendered
         overseer = OverseerUtility(
             files,
-            MaterialUtility.get_materials(files)
+            materials if materials is not None
+            else MaterialUtility.get_materials(files)
         )
 
         # we want to indicate if nothing is available to render
         if overseer.total_iterations_to_execute == 0:
             logger().info("No valid renders found")
+        else:
+            # compile the shaders up front so that the render times only
+            # include rendering
+            RenderUtility.warmup(overseer.materials())
+
+        # a persistent worker renders many jobs, so it is not journaled
+        journal = None if run_settings().serve() else render_journal()
+        if journal is not None and journal.completed_count() > 0:
+            logger().info("Resuming, " + str(journal.completed_count())
+                          + " out of " + str(overseer.total_iterations_to_execute)
+                          + " renders already completed")
+
+        # execute each iteration that has not been completed and whose
+        # output does not exist, the overseer dispatches to each of the
+        # sub overseers
+        rendered = 0
+        iterations = overseer.iterations_to_execute(iteration_ranges, shard) \
+            if changed_files is None \
+            else overseer.iterations_for_files(changed_files)
+        for iteration in iterations:
+            if journal is not None and journal.is_completed(
+                    iteration, overseer.file_name_for_iteration(iteration)):
+                continue
 
-        # call the overseer update which will dispatch to each of
-        # the sub overseers
-        for index in range(overseer.total_iterations_to_execute):
-            overseer.update()
+            file_path = overseer.execute(iteration)
+            rendered += 1
+            if journal is not None:
+                journal.record(iteration, file_path)
+
+        if journal is not None:
+            journal.close()
+        overseer.report_schedule()
+        return rendered
 
     @staticmethod
-    def driver() -> None:
-        """ Core app function that handles set up and calls process(). """
+    def setup() -> None:
+        """ Prepares the scene for rendering. """
 
-        logger().info(" >>>>>>>>>>>>> Driver Running <<<<<<<<<<<<<")
-        # this tracks total time of execution
-        time_tracker().start("execution")
         # start by clearing everything from the scene
         ClearUtility.clear_all()
         # realign the camera
         camera().point_camera_at_origin()
         # perform all settings updates
         SettingsUtility.update_settings()
-        # parse the each of the directories and pass to the handler function
-        Driver.process(parse_directories())
 
-        # perform cleanup, end timers and report all info
-        ClearUtility.clear_all()
+    @staticmethod
+    def report() -> None:
+        """ Ends the execution timer and reports all info. """
+
         time_tracker().end("execution")
         stat_tracker().report_stats()
         time_tracker().report_times()
+        # keep the tracked times to schedule future runs
+        if app_settings().parameters().time_tracking_enabled():
+            cost_history().record_reports(time_tracker().reports())
+            cost_history().save()
+
+    @staticmethod
+    def driver() -> None:
+        """ Core app function that handles set up and calls process(). """
+
+        logger().info(" >>>>>>>>>>>>> Driver Running <<<<<<<<<<<<<")
+        # this tracks total time of execution
+        time_tracker().start("execution")
+        Driver.setup()
+        # parse the each of the directories and pass this process' shard
+        # to the handler function
+        files = parse_directories()
+        Driver.process(ShardUtility.files_for_shard(files),
+                       iteration_ranges=run_settings().iteration_ranges(),
+                       shard=ShardUtility.outermost_shard(files))
+
+        # perform cleanup, end timers and report all info
+        ClearUtility.clear_all()
+        Driver.report()
         logger().info(" >>>>>>>>>>>>> Driver Complete <<<<<<<<<<<<<")
 
+    @staticmethod
+    def handle_job(job: dict,
+                   parameters: dict,
+                   signature: dict,
+                   materials: list,
+                   material_signature: list) -> dict:
+        """ Renders the provided job with the loaded materials. Returns
+            the reply for the client. """
+
+        files = parse_directories()
+        # the settings or the material library changed since loading
+        if WorkerUtility.signature(parameters) != signature \
+                or WorkerUtility.file_signature(
+                    files[app_settings().material_collection()]
+                ) != material_signature:
+            return {'status': 'stale'}
+
+        if job['signature'] != signature:
+            return {'status': 'mismatch'}
+
+        time_tracker().start("execution")
+        rendered = Driver.process(
+            ShardUtility.files_for_shard(files, job['shard_index'],
+                                         job['shard_count']),
+            materials,
+            job['iteration_ranges'],
+            job.get('changed_files'),
+            ShardUtility.outermost_shard(files, job['shard_index'],
+                                         job['shard_count'])
+        )
+        Driver.report()
+        # each job reports only its own stats and times
+        stat_tracker().clear()
+        time_tracker().clear()
+        return {'status': 'done', 'rendered': rendered}
+
+    @staticmethod
+    def serve(parameters: dict,
+              socket_path: str) -> None:
+        """ Runs this Blender process as a persistent worker. The scene
+            and the material library are loaded once, then each render job
+            received on the socket is rendered until the worker is shut
+            down, becomes stale or is idle for longer than the timeout. """
+
+        logger().info(" >>>>>>>>>>>>> Worker Running <<<<<<<<<<<<<")
+        Driver.setup()
+        signature = WorkerUtility.signature(parameters)
+        files = parse_directories()
+        material_signature = WorkerUtility.file_signature(
+            files[app_settings().material_collection()]
+        )
+        materials = MaterialUtility.get_materials(files)
+        time_tracker().clear()
+
+        if path.exists(socket_path):
+            remove(socket_path)
+        server = socket(AF_UNIX, SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen()
+        server.settimeout(run_settings().idle_timeout() or None)
+        lock_file = open(WorkerUtility.lock_path(socket_path), "a")
+
+        status = 'ready'
+        while status in ['ready', 'done', 'mismatch', 'invalid']:
+            try:
+                connection, _ = server.accept()
+            except timeout:
+                break
+
+            with connection:
+                # jobs block in blocking mode, only accept() times out
+                connection.settimeout(None)
+                job = WorkerUtility.receive(connection)
+                if job['type'] == 'closed':
+                    continue
+
+                flock(lock_file, LOCK_EX)
+                try:
+                    if job['type'] == 'render':
+                        reply = Driver.handle_job(job, parameters, signature,
+                                                  materials,
+                                                  material_signature)
+                    elif job['type'] == 'ping':
+                        reply = {'status': 'ready'}
+                    elif job['type'] == 'shutdown':
+                        reply = {'status': 'shutdown'}
+                    else:
+                        reply = {'status': 'invalid'}
+                except Exception as e:
+                    logger().exception(e)
+                    reply = {'status': 'error', 'message': str(e)}
+                finally:
+                    flock(lock_file, LOCK_UN)
+
+                status = reply['status']
+                try:
+                    WorkerUtility.respond(connection, reply)
+                except OSError:
+                    logger().error("Worker client disconnected")
+
+        server.close()
+        lock_file.close()
+        WorkerUtility.remove_socket(socket_path)
+        ClearUtility.clear_all()
+        logger().info(" >>>>>>>>>>>>> Worker Complete <<<<<<<<<<<<<")
+
+    @staticmethod
+    def lease(address: str) -> None:
+        """ Renders the chunks leased from the coordinator until the plan
+            is completed. The overseers are kept across chunks, so the
+            coordinator can lease chunks that reuse the appended
+            collections. """
+
+        logger().info(" >>>>>>>>>>>>> Worker Running <<<<<<<<<<<<<")
+        time_tracker().start("execution")
+        Driver.setup()
+        files = parse_directories()
+        overseer = OverseerUtility(files,
+                                   MaterialUtility.get_materials(files))
+        if overseer.total_iterations_to_execute > 0:
+            # compile the shaders up front so that the render times only
+            # include rendering
+            RenderUtility.warmup(overseer.materials())
+
+        overwrite = app_settings().parameters().overwrite()
+        worker = gethostname() + '-' + str(getpid())
+        rendered = 0
+        while True:
+            reply = Coordinator.request(address, {
+                'type': 'lease',
+                'worker': worker,
+                'collection_states': overseer.collection_states()
+            })
+            if reply['status'] == 'wait':
+                sleep(reply['retry'])
+                continue
+            if reply['status'] != 'leased':
+                break
+
+            # iterations are only meaningful for the same iteration space
+            if reply['total'] != overseer.total_iterations_to_execute:
+                logger().error("Coordinator plans "
+                               + str(reply['total'])
+                               + " renders, this worker plans "
+                               + str(overseer.total_iterations_to_execute))
+                break
+
+            lease = {'worker': worker, 'chunk': reply['chunk']}
+            for iteration in reply['iterations']:
+                if not overwrite and overseer.is_rendered(iteration):
+                    continue
+
+                overseer.execute(iteration)
+                rendered += 1
+                # stop when the chunk was issued to another worker
+                if Coordinator.request(address, {'type': 'renew', **lease}) \
+                        ['status'] == 'expired':
+                    break
+            else:
+                Coordinator.request(address, {'type': 'complete', **lease})
+
+        logger().info("Rendered " + str(rendered) + " leased renders")
+        overseer.report_schedule()
+        ClearUtility.clear_all()
+        Driver.report()
+        logger().info(" >>>>>>>>>>>>> Worker Complete <<<<<<<<<<<<<")
+
 
 if __name__ == "__main__":
     """ Entry point into the core app. Calls into the
@@ -73,7 +314,16 @@ if __name__ == "__main__":
     app_settings(settings_paths[0])
     blender_settings(settings_paths[1])
     type_settings(settings_paths[2])
-    # settings are parsed, execute core function
-    Driver.driver()
+    run_settings(settings_paths[3:])
+    # settings are parsed, execute core function or serve render jobs
+    if run_settings().coordinator() is not None:
+        Driver.lease(run_settings().coordinator())
+    elif run_settings().serve() is not None:
+        Driver.serve({'app_settings': settings_paths[0],
+                      'blender_settings': settings_paths[1],
+                      'types': settings_paths[2]},
+                     run_settings().serve())
+    else:
+        Driver.driver()
     # call exit to kill Blender process
     exit()
@@ -3,21 +3,172 @@
     and executes Blender.
 """
 
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
 from os import getcwd, path
-from subprocess import run
+from time import sleep
+from typing import Optional
 
-from src.parsers.settings_parser import app_settings
+from src.classes.supervisor import Supervisor
+from src.classes.watcher import Watcher
+from src.parsers.directory_parser import parse_directories
+from src.parsers.settings_parser import app_settings, run_settings
+from src.utilities.shard_utility import ShardUtility
+from src.utilities.worker_utility import WorkerUtility
 
+# seconds without changes before the changed files are rendered
+WATCH_SETTLE_SECONDS = 5
 
-def execute(parameters: dict) -> None:
+
+def submit(command: list,
+           parameters: dict,
+           shard_count: int) -> None:
+    """ Submits one render job per shard to the persistent worker pool and
+        waits for all of them to finish. Idle workers started with the same
+        settings are reused, new workers are launched otherwise. """
+
+    # the worker arguments only control the lifetime of new workers
+    worker_command = command + ["--idle-timeout",
+                                str(run_settings().idle_timeout())]
+    jobs = [WorkerUtility.job(parameters, shard_index, shard_count,
+                              run_settings().iteration_ranges())
+            for shard_index in range(shard_count)]
+    claimed = set()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        replies = list(executor.map(
+            lambda job: WorkerUtility.submit(worker_command, job, claimed),
+            jobs
+        ))
+
+    for shard_index, reply in enumerate(replies):
+        if reply['status'] == 'done':
+            print("Shard " + str(shard_index) + ": rendered "
+                  + str(reply['rendered']))
+        else:
+            print("Shard " + str(shard_index) + ": failed, "
+                  + str(reply.get('message', reply['status'])))
+
+
+def watch(command: list,
+          parameters: dict) -> None:
+    """ Watches the collection directories and submits the renders using
+        added or modified files to the persistent worker pool. Only the
+        renders that use those files are enumerated, and rendered again
+        when their output exists. Changed material files retire the worker,
+        so the job is rendered by a worker that loaded them again. """
+
+    worker_command = command + ["--idle-timeout", "0"]
+    directories = [path.join(app_settings().paths().search_dir_path(),
+                             directory)
+                   for directory in app_settings().collections().values()]
+    watcher = Watcher(directories, run_settings().poll_seconds())
+    snapshot = Watcher.snapshot(parse_directories())
+    print("Watching " + str(len(directories)) + " collection directories")
+    while True:
+        watcher.wait()
+        # wait until the files stop changing, e.g. while they are copied
+        current = Watcher.snapshot(parse_directories())
+        while True:
+            sleep(WATCH_SETTLE_SECONDS)
+            settled = Watcher.snapshot(parse_directories())
+            if settled == current:
+                break
+            current = settled
+
+        changed_files = Watcher.changed_files(snapshot, current)
+        snapshot = current
+        changed_paths = [file_path for file_list in changed_files.values()
+                         for file_path in file_list]
+        if not changed_paths:
+            continue
+
+        print("Submitting renders for " + str(len(changed_paths))
+              + " changed files")
+        reply = WorkerUtility.submit(
+            worker_command,
+            WorkerUtility.job(parameters, changed_files=changed_paths)
+        )
+        print("Rendered " + str(reply.get('rendered', 0)) + ", status: "
+              + reply['status'])
+
+
+def supervise(commands: list) -> None:
+    """ Executes each of the Blender commands at the same time under the
+        supervisor, which reports the progress and restarts the Blender
+        processes that crash or hang. """
+
+    failed = run(Supervisor(commands,
+                            run_settings().render_timeout(),
+                            run_settings().max_restarts()).supervise())
+    if failed > 0:
+        print(str(failed) + " out of " + str(len(commands))
+              + " Blender processes failed")
+
+
+def execute(parameters: dict,
+            arguments: Optional[list] = None) -> None:
     """ Extracts the necessary settings then executes Blender in
-        a subprocess. """
+        a subprocess. When multiple workers are requested, one Blender
+        subprocess is executed per shard. With the worker pool, the shards
+        are submitted to persistent Blender processes instead. """
     app_settings(parameters['app_settings'])
+    run_settings(arguments)
+    if run_settings().shutdown_pool():
+        print("Shut down " + str(WorkerUtility.shutdown()) + " workers")
+        return
+
     path_settings = app_settings().paths()
 
     blender_exe = path_settings.blender_exe()
     blend_file = path.join(getcwd(), path_settings.main_file())
     driver = path.join(getcwd(), path_settings.driver())
+    # an exception in the driver exits Blender with an error, so that the
+    # supervisor restarts it
+    command = [blender_exe, "-b", "--python-exit-code", "1",
+               "--python", driver,
+               blend_file, "--", *parameters.values()]
+
+    if run_settings().index():
+        indexer = path.join(path.dirname(driver), 'indexer.py')
+        supervise([[blender_exe, "-b", "--python-exit-code", "1",
+                    "--python", indexer, "--", *parameters.values()]])
+        return
+
+    if run_settings().slim():
+        slimmer = path.join(path.dirname(driver), 'slimmer.py')
+        arguments = ["--unpack-images"] if run_settings().unpack_images() \
+            else list()
+        supervise([[blender_exe, "-b", "--python-exit-code", "1",
+                    "--python", slimmer, "--", *parameters.values(),
+                    *arguments]])
+        return
+
+    if run_settings().hdri_variants():
+        downsampler = path.join(path.dirname(driver), 'downsampler.py')
+        supervise([[blender_exe, "-b", "--python-exit-code", "1",
+                    "--python", downsampler, "--", *parameters.values()]])
+        return
+
+    # workers lease their renders from the coordinator instead of sharding
+    if run_settings().coordinator() is not None:
+        supervise([command + run_settings().driver_arguments()
+                   for _ in range(run_settings().workers())])
+        return
+
+    shard_count = 1
+    if run_settings().workers() > 1:
+        shard_count = ShardUtility.shard_count(parse_directories(),
+                                               run_settings().workers())
+
+    if run_settings().watch():
+        watch(command, parameters)
+        return
+
+    if run_settings().pool():
+        submit(command, parameters, shard_count)
+        return
 
-    run([blender_exe, "-b", "--python", driver,
-         blend_file, "--", *parameters.values()])
+    # each process renders its own shard, wait for all of them to finish
+    supervise([command + run_settings().driver_arguments(shard_index,
+                                                         shard_count)
+               for shard_index in range(shard_count)])
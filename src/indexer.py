@@ -0,0 +1,56 @@
+""" This module scans the collection files into the asset index and exits
+    Blender on completion.
+"""
+
+from sys import argv, exit
+
+
+from src.parsers.directory_parser import parse_directories
+from src.parsers.settings_parser import app_settings, blender_settings, \
+    run_settings, type_settings
+from src.trackers.asset_index import asset_index
+from src.trackers.logger import logger
+from src.utilities.index_utility import IndexUtility
+
+
+class Indexer:
+    """ This class scans each file that changed since it was indexed. """
+
+    @staticmethod
+    def index() -> None:
+        """ Scans the changed files and removes the deleted files. """
+
+        logger().info(" >>>>>>>>>>>>> Indexer Running <<<<<<<<<<<<<")
+        files = parse_directories()
+        stale_files = asset_index().stale_files(files)
+        count = sum(len(file_list) for file_list in stale_files.values())
+        scanned = 0
+        for collection, file_list in stale_files.items():
+            for file_path in file_list:
+                scanned += 1
+                logger().info("Index " + str(scanned) + " out of "
+                              + str(count) + ": " + file_path)
+                asset_index().record(file_path, collection,
+                                     IndexUtility.scan_file(file_path,
+                                                            collection))
+                # keep the scanned files when the scan is interrupted
+                asset_index().commit()
+
+        pruned = asset_index().prune(files)
+        asset_index().commit()
+        logger().info("Indexed " + str(count) + " files, removed "
+                      + str(pruned) + " deleted files")
+        logger().info(" >>>>>>>>>>>>> Indexer Complete <<<<<<<<<<<<<")
+
+
+if __name__ == "__main__":
+    """ Entry point into the indexer. Calls into the
+        settings parsers and executes the indexer. """
+    settings_paths = argv[argv.index("--") + 1:]
+    app_settings(settings_paths[0])
+    blender_settings(settings_paths[1])
+    type_settings(settings_paths[2])
+    run_settings(settings_paths[3:])
+    Indexer.index()
+    # call exit to kill Blender process
+    exit()
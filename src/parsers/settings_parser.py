@@ -1,11 +1,12 @@
 """ This module handles settings parsing.
 """
 
+from argparse import ArgumentParser
 from json import load
 from typing import Optional
 
 from src.classes.settings import AppSettings, BlenderSettings, \
-    TypeSettings
+    RunSettings, TypeSettings
 
 
 class SettingsParser:
@@ -21,9 +22,72 @@ class SettingsParser:
 
         return data
 
+    @staticmethod
+    def parse_arguments(arguments: list) -> dict:
+        """ Performs parsing of the command line arguments. """
+
+        parser = ArgumentParser(description="Blender model aggregation "
+                                            "and rendering")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="number of Blender processes to render "
+                                 "with in parallel")
+        parser.add_argument("--shard-index", type=int, default=0,
+                            help="shard rendered by this Blender process")
+        parser.add_argument("--shard-count", type=int, default=1,
+                            help="total number of shards")
+        parser.add_argument("--resume", action="store_true",
+                            help="resume from the last completed "
+                                 "iteration in the render journal")
+        parser.add_argument("--iterations", default=None,
+                            help="comma separated START:END iteration "
+                                 "ranges to render, END is exclusive")
+        parser.add_argument("--pool", action="store_true",
+                            help="submit the renders to the persistent "
+                                 "worker pool")
+        parser.add_argument("--serve", default=None,
+                            help="socket this Blender process serves "
+                                 "render jobs on as a persistent worker")
+        parser.add_argument("--idle-timeout", type=int, default=1800,
+                            help="seconds a persistent worker waits for a "
+                                 "job before exiting, 0 waits forever")
+        parser.add_argument("--shutdown-pool", action="store_true",
+                            help="shut down the idle persistent workers")
+        parser.add_argument("--coordinator", default=None,
+                            help="HOST:PORT of the coordinator to lease "
+                                 "the renders from")
+        parser.add_argument("--render-timeout", type=float, default=0,
+                            help="seconds a single render may take before "
+                                 "its Blender process is restarted, "
+                                 "0 disables the timeout")
+        parser.add_argument("--max-restarts", type=int, default=3,
+                            help="number of times a crashed or hung "
+                                 "Blender process is restarted")
+        parser.add_argument("--index", action="store_true",
+                            help="scan the changed collection files into "
+                                 "the asset index instead of rendering")
+        parser.add_argument("--slim", action="store_true",
+                            help="write the slim asset cache of the changed "
+                                 "collection files instead of rendering")
+        parser.add_argument("--unpack-images", action="store_true",
+                            help="unpack the packed images of the slimmed "
+                                 "files into shared image files")
+        parser.add_argument("--hdri-variants", action="store_true",
+                            help="write the downsampled hdri variants "
+                                 "instead of rendering")
+        parser.add_argument("--watch", action="store_true",
+                            help="watch the collection directories and "
+                                 "render the renders using new files")
+        parser.add_argument("--poll-seconds", type=float, default=30,
+                            help="seconds between each poll of the "
+                                 "collection directories when inotify "
+                                 "is unavailable")
+
+        return vars(parser.parse_args(arguments))
+
 
 app_settings_instance = None
 blender_settings_instance = None
+run_settings_instance = None
 type_settings_instance = None
 
 
@@ -61,6 +125,22 @@ def blender_settings(blender_settings_path: Optional[str] = None) \
     return blender_settings_instance
 
 
+def run_settings(arguments: Optional[list] = None) \
+        -> RunSettings:
+    """ Singleton accessor that uses dictionary expansion to
+        store each command line argument into it's respective
+        object. """
+
+    global run_settings_instance
+    if run_settings_instance is None:
+        run_settings_instance = \
+            RunSettings(
+                **SettingsParser.parse_arguments(arguments or [])
+            )
+
+    return run_settings_instance
+
+
 def type_settings(type_settings_path: Optional[str] = None) \
         -> TypeSettings:
     """ Singleton accessor that uses dictionary expansion to
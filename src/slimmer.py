@@ -0,0 +1,68 @@
+""" This module writes the slim asset cache and exits Blender on completion.
+"""
+
+from os import path
+from sys import argv, exit
+
+
+from src.parsers.directory_parser import parse_directories
+from src.parsers.settings_parser import app_settings, blender_settings, \
+    run_settings, type_settings
+from src.trackers.logger import logger
+from src.trackers.slim_cache import SlimCache, slim_cache
+from src.utilities.slim_utility import SlimUtility
+
+
+class Slimmer:
+    """ This class slims each file that changed since it was slimmed. """
+
+    @staticmethod
+    def slim() -> None:
+        """ Slims the changed files and removes the slim files of the
+            deleted files. """
+
+        logger().info(" >>>>>>>>>>>>> Slimmer Running <<<<<<<<<<<<<")
+        files = parse_directories()
+        stale_files = slim_cache().stale_files(files)
+        count = sum(len(file_list) for file_list in stale_files.values())
+        slimmed = 0
+        unpack_images = run_settings().unpack_images()
+        for collection, file_list in stale_files.items():
+            for file_path in file_list:
+                slimmed += 1
+                logger().info("Slim " + str(slimmed) + " out of "
+                              + str(count) + ": " + file_path)
+                slim_name = SlimCache.slim_name(
+                    SlimCache.source_hash(file_path), collection
+                )
+                slim_path = slim_cache().slim_path(slim_name)
+                # files with the same contents share a slim file
+                if path.isfile(slim_path) \
+                        or SlimUtility.slim_file(file_path, collection,
+                                                 slim_path, unpack_images):
+                    slim_cache().record(file_path, slim_name)
+                else:
+                    # the file is loaded as is until it changes
+                    slim_cache().record(file_path, SlimCache.NOTHING)
+
+                # keep the slimmed files when slimming is interrupted
+                slim_cache().save()
+
+        removed = slim_cache().prune(files)
+        slim_cache().save()
+        logger().info("Slimmed " + str(count) + " files, removed "
+                      + str(removed) + " unused slim files")
+        logger().info(" >>>>>>>>>>>>> Slimmer Complete <<<<<<<<<<<<<")
+
+
+if __name__ == "__main__":
+    """ Entry point into the slimmer. Calls into the
+        settings parsers and executes the slimmer. """
+    settings_paths = argv[argv.index("--") + 1:]
+    app_settings(settings_paths[0])
+    blender_settings(settings_paths[1])
+    type_settings(settings_paths[2])
+    run_settings(settings_paths[3:])
+    Slimmer.slim()
+    # call exit to kill Blender process
+    exit()
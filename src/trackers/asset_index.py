@@ -0,0 +1,139 @@
+""" This module provides the asset metadata index to the app.
+"""
+
+from json import dumps, loads
+from os import makedirs, path
+from sqlite3 import connect
+from typing import Optional
+
+from src.parsers.settings_parser import app_settings
+
+
+class AssetIndex:
+    """ This class stores the metadata of each collection file, scanned once
+        by a Blender process. Entries are keyed by the file's path, modified
+        time and size, so only changed files are scanned again. The index
+        lets the app validate and plan without opening the files. """
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS assets (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    collection TEXT NOT NULL,
+                    valid INTEGER NOT NULL,
+                    object_count INTEGER NOT NULL,
+                    polygon_count INTEGER NOT NULL,
+                    materials TEXT NOT NULL,
+                    bounding_box TEXT
+                )"""
+
+    def __init__(self,
+                 index_path: str) -> None:
+        makedirs(path.dirname(index_path) or '.', exist_ok=True)
+        self._connection = connect(index_path)
+        self._connection.execute(AssetIndex.SCHEMA)
+
+    @staticmethod
+    def file_key(file_path: str) -> tuple:
+        """ Returns the (path, modified time, size) key of a file. """
+
+        return path.abspath(file_path), path.getmtime(file_path), \
+            path.getsize(file_path)
+
+    def entry(self,
+              file_path: str) -> Optional[dict]:
+        """ Returns the metadata of the provided file, None when the file
+            has not been scanned since it last changed. """
+
+        file_path, mtime, size = AssetIndex.file_key(file_path)
+        row = self._connection.execute(
+            "SELECT collection, valid, object_count, polygon_count, "
+            "materials, bounding_box FROM assets "
+            "WHERE path = ? AND mtime = ? AND size = ?",
+            (file_path, mtime, size)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return {'collection': row[0],
+                'valid': bool(row[1]),
+                'object_count': row[2],
+                'polygon_count': row[3],
+                'materials': loads(row[4]),
+                'bounding_box': loads(row[5]) if row[5] else None}
+
+    def is_valid(self,
+                 file_path: str) -> bool:
+        """ Returns whether the provided file contains its collection. Files
+            that have not been scanned are assumed to be valid. """
+
+        entry = self.entry(file_path)
+        return entry is None or entry['valid']
+
+    def stale_files(self,
+                    files: dict) -> dict:
+        """ Returns the files, by collection, that need to be scanned. """
+
+        return {collection: [file_path for file_path in file_list
+                             if self.entry(file_path) is None]
+                for collection, file_list in files.items()}
+
+    def record(self,
+               file_path: str,
+               collection: str,
+               metadata: dict) -> None:
+        """ Records the scanned metadata of the provided file. """
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*AssetIndex.file_key(file_path), collection,
+             int(metadata['valid']), metadata['object_count'],
+             metadata['polygon_count'], dumps(metadata['materials']),
+             dumps(metadata['bounding_box'])
+             if metadata['bounding_box'] is not None else None)
+        )
+
+    def prune(self,
+              files: dict) -> int:
+        """ Removes the entries of files that no longer exist. Returns the
+            number of entries removed. """
+
+        file_paths = {path.abspath(file_path)
+                      for file_list in files.values() for file_path in file_list}
+        stale_paths = [(row[0],) for row
+                       in self._connection.execute("SELECT path FROM assets")
+                       if row[0] not in file_paths]
+        self._connection.executemany("DELETE FROM assets WHERE path = ?",
+                                     stale_paths)
+        return len(stale_paths)
+
+    def commit(self) -> None:
+        """ Writes the recorded entries to disk. """
+
+        self._connection.commit()
+
+
+_instance = None
+
+
+def asset_index_path() -> str:
+    """ Returns the path of the asset index. """
+
+    return path.join(app_settings().paths().log_dir(), 'asset_index.sqlite')
+
+
+def has_asset_index() -> bool:
+    """ Returns whether the asset index exists. Opening the index creates
+        it, so callers that only read the index check this first. """
+
+    return _instance is not None or path.isfile(asset_index_path())
+
+
+def asset_index() -> AssetIndex:
+    """ Singleton accessor for this class. """
+
+    global _instance
+    if _instance is None:
+        _instance = AssetIndex(asset_index_path())
+
+    return _instance
@@ -0,0 +1,123 @@
+""" This module provides the recorded cost history to the app.
+"""
+
+from json import dump, load
+from os import getpid, makedirs, path, replace
+from typing import Optional
+
+from src.parsers.settings_parser import app_settings
+
+
+class CostHistory:
+    """ This class stores the times tracked by previous runs, by time
+        type, collection and asset. The history is used to predict how
+        long future operations will take. """
+
+    def __init__(self,
+                 history_path: str) -> None:
+        self._history_path = history_path
+        self._history = CostHistory.read(history_path)
+        # the times recorded by this run, merged into the file when saved
+        self._recorded = dict()
+
+    @staticmethod
+    def read(history_path: str) -> dict:
+        """ Reads the history from the provided file. The history maps each
+            time type to its collections, each collection to its assets and
+            each asset to a [count, total time] pair. """
+
+        if not path.exists(history_path):
+            return dict()
+
+        with open(history_path, "r") as history_file:
+            return load(history_file)
+
+    @staticmethod
+    def add(history: dict,
+            time_type: str,
+            collection: Optional[str],
+            asset: Optional[str],
+            count: int,
+            elapsed: float) -> None:
+        """ Adds the provided occurrences to the provided history. """
+
+        assets = history.setdefault(time_type, dict()) \
+            .setdefault(str(collection or ''), dict())
+        entry = assets.setdefault(str(asset or ''), [0, 0.0])
+        entry[0] += count
+        entry[1] += elapsed
+
+    def record(self,
+               time_type: str,
+               collection: Optional[str],
+               asset: Optional[str],
+               elapsed: float) -> None:
+        """ Records an occurrence of the provided time. """
+
+        CostHistory.add(self._history, time_type, collection, asset,
+                        1, elapsed)
+        CostHistory.add(self._recorded, time_type, collection, asset,
+                        1, elapsed)
+
+    def record_reports(self,
+                       reports: list) -> None:
+        """ Records each of the provided time reports. """
+
+        for report in reports:
+            self.record(report.get_time_type(), report.get_collection(),
+                        report.get_asset(), report.get_elapsed())
+
+    def mean(self,
+             time_type: str,
+             collection: Optional[str] = None,
+             asset: Optional[str] = None) -> Optional[float]:
+        """ Returns the mean recorded time for the provided time type and
+            collection, across all assets when no asset is provided.
+            Returns None when nothing has been recorded. """
+
+        assets = self._history.get(time_type, dict()) \
+            .get(str(collection or ''), dict())
+        entries = list(assets.values()) if asset is None \
+            else [assets[asset]] if asset in assets else list()
+
+        count = sum(entry[0] for entry in entries)
+        if count == 0:
+            return None
+
+        return sum(entry[1] for entry in entries) / count
+
+    def save(self) -> None:
+        """ Writes the times recorded since the last save to disk. The history is
+            read again first so that the times recorded by other Blender
+            processes in the meantime are kept. The file is replaced
+            atomically so that a crash never leaves a partial history. """
+
+        history = CostHistory.read(self._history_path)
+        for time_type, collections in self._recorded.items():
+            for collection, assets in collections.items():
+                for asset, (count, elapsed) in assets.items():
+                    CostHistory.add(history, time_type, collection, asset,
+                                    count, elapsed)
+
+        makedirs(path.dirname(self._history_path) or '.', exist_ok=True)
+        temporary_path = self._history_path + '.' + str(getpid())
+        with open(temporary_path, "w") as history_file:
+            dump(history, history_file, indent=4)
+
+        replace(temporary_path, self._history_path)
+        # the recorded times are now part of the file
+        self._recorded = dict()
+
+
+_instance = None
+
+
+def cost_history() -> CostHistory:
+    """ Singleton accessor for this class. """
+
+    global _instance
+    if _instance is None:
+        _instance = CostHistory(path.join(app_settings().paths().log_dir(),
+                                          'cost_history.json'))
+
+    return _instance
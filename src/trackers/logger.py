@@ -6,7 +6,7 @@ from os import path
 from time import strftime
 from typing import Optional
 
-from src.parsers.settings_parser import app_settings
+from src.parsers.settings_parser import app_settings, run_settings
 
 
 class Logger:
@@ -64,9 +64,12 @@ def logger(name: Optional[str] = __name__) -> Logger:
 
     global _logger_instances
     if name not in _logger_instances:
+        log_name = str(strftime("%m-%d-%Y_%H-%M-%S"))
+        # shards run at the same time and need their own log files
+        if run_settings().sharded():
+            log_name += '_shard' + str(run_settings().shard_index())
         log_name = path.join(app_settings().paths().log_dir(),
-                             str(strftime("%m-%d-%Y_%H-%M-%S"))
-                             + '_log.txt')
+                             log_name + '_log.txt')
         _logger_instances[name] = Logger(name, log_name)
 
     return _logger_instances[name]
@@ -0,0 +1,117 @@
+""" This module provides render journaling to the app.
+"""
+
+from os import fsync, makedirs, path
+
+from src.parsers.settings_parser import app_settings, run_settings
+
+
+class RenderJournal:
+    """ This class provides an append only journal of the completed
+        iterations and their output files. The journal is written to disk
+        in batches so that a crashed run can be resumed from it. """
+
+    # number of records written between each flush to disk
+    BATCH_SIZE = 10
+
+    def __init__(self,
+                 journal_path: str,
+                 resume: bool) -> None:
+        self._journal_path = journal_path
+        self._completed = dict()
+        self._pending = 0
+
+        makedirs(path.dirname(journal_path) or '.', exist_ok=True)
+        if resume:
+            self._completed = RenderJournal.read(journal_path)
+
+        # a new run starts a new journal, a resumed run appends to it
+        self._journal_file = open(journal_path, "a" if resume else "w")
+        if resume and self._journal_file.tell() > 0:
+            # terminate a record that was only partially written by a crash
+            with open(journal_path, "rb") as journal_file:
+                journal_file.seek(-1, 2)
+                if journal_file.read(1) != b"\n":
+                    self._journal_file.write("\n")
+
+    @staticmethod
+    def read(journal_path: str) -> dict:
+        """ Reads the output file of each completed iteration from the
+            provided journal. """
+
+        completed = dict()
+        if not path.exists(journal_path):
+            return completed
+
+        with open(journal_path, "r") as journal_file:
+            for line in journal_file:
+                fields = line.rstrip("\n").split("\t")
+                # skip records that were only partially written by a crash
+                if len(fields) != 2 or not fields[0].isdigit():
+                    continue
+
+                completed[int(fields[0])] = fields[1]
+
+        return completed
+
+    def completed_count(self) -> int:
+        """ Returns the number of iterations read from the journal. """
+
+        return len(self._completed)
+
+    def is_completed(self,
+                     iteration: int,
+                     file_path: str) -> bool:
+        """ Returns whether the provided iteration was completed by a
+            previous run to the provided output file and the file still
+            exists. An iteration whose output file differs, e.g. after the
+            settings or the files changed, is not completed. """
+
+        return self._completed.get(iteration) == file_path \
+            and path.exists(file_path)
+
+    def record(self,
+               iteration: int,
+               file_path: str) -> None:
+        """ Records the provided iteration as completed. """
+
+        self._journal_file.write(str(iteration) + "\t" + file_path + "\n")
+        self._pending += 1
+        if self._pending >= RenderJournal.BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Writes all pending records to disk. """
+
+        self._journal_file.flush()
+        fsync(self._journal_file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        """ Writes all pending records to disk and closes the journal. """
+
+        if self._journal_file.closed:
+            return
+
+        self.flush()
+        self._journal_file.close()
+
+
+_instance = None
+
+
+def render_journal() -> RenderJournal:
+    """ Singleton accessor for this class. """
+
+    global _instance
+    if _instance is None:
+        journal_name = 'render_journal'
+        # shards run at the same time and each render their own iterations
+        if run_settings().sharded():
+            journal_name += '_shard' + str(run_settings().shard_index()) \
+                            + '_of_' + str(run_settings().shard_count())
+        journal_path = path.join(app_settings().paths().log_dir(),
+                                 journal_name + '.txt')
+        _instance = RenderJournal(journal_path, run_settings().resume())
+
+    return _instance
@@ -0,0 +1,178 @@
+""" This module provides the slim asset cache to the app.
+"""
+
+from hashlib import sha1
+from json import dump, load
+from os import listdir, makedirs, path, remove
+from typing import Optional
+
+from src.parsers.settings_parser import app_settings
+
+
+class SlimCache:
+    """ This class maps each collection file to a slim copy containing only
+        the file's collection, or materials, and their dependencies. Slim
+        files are named by the hash of their source file's contents and of
+        the collection, and the manifest maps each source file's path,
+        modified time and size to that name, so resolving a file only needs
+        to stat it. Files without their collection are recorded with an
+        empty name, so they are not slimmed again until they change. """
+
+    MANIFEST = 'manifest.json'
+    # the manifest entry of a file that has nothing to slim
+    NOTHING = ''
+    IMAGE_DIR = 'images'
+    HASH_BLOCK_SIZE = 1 << 20
+
+    def __init__(self,
+                 cache_dir: str) -> None:
+        self._cache_dir = cache_dir
+        self._manifest = dict()
+        manifest_path = path.join(cache_dir, SlimCache.MANIFEST)
+        if path.isfile(manifest_path):
+            with open(manifest_path, "r") as manifest_file:
+                self._manifest = load(manifest_file)
+
+    def cache_dir(self) -> str:
+        """ Returns the directory of the slim files. """
+
+        return self._cache_dir
+
+    @staticmethod
+    def file_key(file_path: str) -> str:
+        """ Returns the manifest key of a file, its path, modified time
+            and size. """
+
+        return path.abspath(file_path) + '|' \
+            + str(path.getmtime(file_path)) + '|' \
+            + str(path.getsize(file_path))
+
+    @staticmethod
+    def source_hash(file_path: str) -> str:
+        """ Returns the hash of the contents of the provided file. """
+
+        digest = sha1()
+        with open(file_path, "rb") as source_file:
+            block = source_file.read(SlimCache.HASH_BLOCK_SIZE)
+            while block:
+                digest.update(block)
+                block = source_file.read(SlimCache.HASH_BLOCK_SIZE)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def slim_name(digest: str,
+                  collection: str) -> str:
+        """ Returns the name of the slim file for the provided hash and
+            collection. Files with the same contents only share a slim file
+            when they are loaded for the same collection. """
+
+        return digest + '_' + sha1(collection.encode()).hexdigest()[:8]
+
+    def slim_path(self,
+                  slim_name: str) -> str:
+        """ Returns the path of the slim file with the provided name. """
+
+        return path.join(self._cache_dir, slim_name + '.blend')
+
+    def image_path(self,
+                   digest: str,
+                   extension: str) -> str:
+        """ Returns the path of an unpacked image for the provided hash.
+            Images with the same contents share a single file. """
+
+        return path.join(self._cache_dir, SlimCache.IMAGE_DIR,
+                         digest + extension)
+
+    def entry(self,
+              file_path: str) -> Optional[str]:
+        """ Returns the slim file name recorded for the provided file, None
+            when the file has not been slimmed since it last changed. """
+
+        try:
+            return self._manifest.get(SlimCache.file_key(file_path))
+        except OSError:
+            return None
+
+    def cached_file(self,
+                    file_path: str) -> Optional[str]:
+        """ Returns the slim file of the provided file, None when the file
+            has not been slimmed since it last changed or has nothing to
+            slim. """
+
+        slim_name = self.entry(file_path)
+        if not slim_name or not path.isfile(self.slim_path(slim_name)):
+            return None
+
+        return self.slim_path(slim_name)
+
+    def resolve(self,
+                file_path: str) -> str:
+        """ Returns the file to load the provided file's data from, the
+            slim file when available and the file itself otherwise. """
+
+        return self.cached_file(file_path) or file_path
+
+    def stale_files(self,
+                    files: dict) -> dict:
+        """ Returns the files, by collection, that need to be slimmed. """
+
+        return {collection: [file_path for file_path in file_list
+                             if self.entry(file_path) != SlimCache.NOTHING
+                             and self.cached_file(file_path) is None]
+                for collection, file_list in files.items()}
+
+    def record(self,
+               file_path: str,
+               slim_name: str) -> None:
+        """ Records the slim file of the provided file, NOTHING when the
+            file has nothing to slim. """
+
+        # the previous entry of a changed file is replaced
+        self._manifest = {key: value for key, value in self._manifest.items()
+                          if key.split('|')[0] != path.abspath(file_path)}
+        self._manifest[SlimCache.file_key(file_path)] = slim_name
+
+    def prune(self,
+              files: dict) -> int:
+        """ Removes the entries of files that no longer exist and the slim
+            files that no entry uses. Returns the number of files removed. """
+
+        file_paths = {path.abspath(file_path)
+                      for file_list in files.values() for file_path in file_list}
+        self._manifest = {key: value for key, value in self._manifest.items()
+                          if key.split('|')[0] in file_paths}
+        slim_names = set(self._manifest.values())
+        removed = 0
+        if not path.isdir(self._cache_dir):
+            return removed
+
+        for file_name in listdir(self._cache_dir):
+            if file_name.endswith('.blend') \
+                    and file_name[:-len('.blend')] not in slim_names:
+                remove(path.join(self._cache_dir, file_name))
+                removed += 1
+
+        return removed
+
+    def save(self) -> None:
+        """ Writes the manifest to disk. """
+
+        makedirs(self._cache_dir, exist_ok=True)
+        with open(path.join(self._cache_dir, SlimCache.MANIFEST), "w") \
+                as manifest_file:
+            dump(self._manifest, manifest_file, indent=4)
+
+
+_instance = None
+
+
+def slim_cache() -> SlimCache:
+    """ Singleton accessor for this class. """
+
+    global _instance
+    if _instance is None:
+        _instance = SlimCache(path.join(app_settings().paths().log_dir(),
+                                        'slim_cache'))
+
+    return _instance
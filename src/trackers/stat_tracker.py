@@ -47,10 +47,11 @@ class StatTracker:
 
             return self._count
 
-        def increase_count(self) -> None:
-            """ Increments this stat report's count. """
+        def increase_count(self,
+                           count: int = 1) -> None:
+            """ Increases this stat report's count by the provided count. """
 
-            self._count += 1
+            self._count += count
 
         def __str__(self) -> str:
             stat_str = "Stat: " + self._stat
@@ -72,7 +73,8 @@ class StatTracker:
     def update_stat(self,
                     stat_type: str,
                     collection: Optional[str] = None,
-                    msg: Optional[str] = None) -> None:
+                    msg: Optional[str] = None,
+                    count: int = 1) -> None:
         """ Update the specified stat report, increasing its count. """
 
         if not app_settings().parameters().stat_tracking_enabled():
@@ -87,9 +89,15 @@ class StatTracker:
             # create a new report for this type if one doesn't exist
             self._stats_report[stat_key] = \
                 StatTracker.StatReport(stat_type, collection, msg)
+            self._stats_report[stat_key].increase_count(count - 1)
         else:
             # increment the count for this report if already created
-            self._stats_report[stat_key].increase_count()
+            self._stats_report[stat_key].increase_count(count)
+
+    def clear(self) -> None:
+        """ Removes all of the tracked stats. """
+
+        self._stats_report = dict()
 
     def report_stats(self) -> None:
         """ Reports all of the tracked stats. """
@@ -22,9 +22,11 @@ class TimeTracker:
         def __init__(self,
                      time_type: str,
                      elapsed: float,
-                     collection: Optional[str] = None) -> None:
+                     collection: Optional[str] = None,
+                     asset: Optional[str] = None) -> None:
             self._time_type = time_type
             self._collection = collection
+            self._asset = asset
             self._elapsed = elapsed
 
         def get_time_type(self) -> str:
@@ -37,6 +39,11 @@ class TimeTracker:
 
             return self._collection
 
+        def get_asset(self) -> Optional[str]:
+            """ Returns this time report's asset if applicable. """
+
+            return self._asset
+
         def get_elapsed(self) -> float:
             """ Returns this time report's time value. """
 
@@ -63,8 +70,10 @@ class TimeTracker:
 
     def start(self,
               time_type: str,
-              collection: Optional[str] = None) -> None:
-        """ Starts the timer for this time type and collection. """
+              collection: Optional[str] = None,
+              asset: Optional[str] = None) -> None:
+        """ Starts the timer for this time type and collection. The asset
+            optionally records what the time was spent on. """
 
         if not app_settings().parameters().time_tracking_enabled():
             return
@@ -77,7 +86,7 @@ class TimeTracker:
         # This retains references to the active objects and will be removed
         # upon execution of end.
         self._active_times[(time_type, collection)] = \
-            TimeTracker.TimeReport(time_type, time(), collection)
+            TimeTracker.TimeReport(time_type, time(), collection, asset)
 
     def end(self,
             time_type: str,
@@ -115,6 +124,23 @@ class TimeTracker:
         return [report for report in self._time_report
                 if report.get_time_type() == time_type]
 
+    def reports(self) -> list:
+        """ Returns all of the completed time reports. """
+
+        return self._time_report
+
+    def clear(self) -> None:
+        """ Removes all of the completed time reports. """
+
+        self._time_report = list()
+
+    def elapsed(self,
+                time_type: str) -> float:
+        """ Returns the total time tracked for the provided time type. """
+
+        return sum([report.get_elapsed()
+                    for report in self._aggregate_by_type(time_type)])
+
     def report_times(self) -> None:
         """ Reports all of the tracked times. """
 
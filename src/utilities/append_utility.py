@@ -2,10 +2,13 @@
     Blender files.
 """
 
-from bpy import data, ops
+from bpy import context, data, ops
 
 from src.classes.exceptions import CollectionNotFoundException
+from src.classes.scene_index import scene_index
 from src.parsers.settings_parser import app_settings
+from src.trackers.logger import logger
+from src.trackers.slim_cache import slim_cache
 from src.trackers.stat_tracker import stat_tracker
 from src.trackers.time_tracker import time_tracker
 
@@ -18,7 +21,11 @@ class AppendUtility:
                          collection: str) -> None:
         time_tracker().start("append", collection)
 
-        collection_path = file_path + \
+        # the slim file only holds the collection and its dependencies
+        source_path = slim_cache().resolve(file_path)
+        if source_path != file_path:
+            stat_tracker().update_stat("slim_hit", collection)
+        collection_path = source_path + \
             app_settings().paths().blender_collection()
         # append the collection to this file
         ops.wm.append(filename=collection,
@@ -34,3 +41,63 @@ class AppendUtility:
                                               + collection
                                               + "' not found in: '"
                                               + file_path)
+
+        scene_index().add(data.collections[collection])
+
+    @staticmethod
+    def link_from_file(file_path: str,
+                       collection: str) -> bool:
+        """ Links the collection from the file and instantiates it in the
+            scene as a library override. The overridden objects are local,
+            while their meshes and materials remain shared with the library.
+            Returns whether the collection was linked. """
+
+        time_tracker().start("link", collection)
+        try:
+            with data.libraries.load(slim_cache().resolve(file_path),
+                                     link=True) \
+                    as (data_from, data_to):
+                if collection in data_from.collections:
+                    data_to.collections = [collection]
+
+            linked = data_to.collections[0] if data_to.collections else None
+            if linked is None:
+                return False
+
+            try:
+                override = linked.override_hierarchy_create(
+                    context.scene, context.view_layer, do_fully_editable=True
+                )
+            except TypeError:
+                # versions before 3.2 do not support fully editable overrides
+                override = linked.override_hierarchy_create(
+                    context.scene, context.view_layer
+                )
+
+            if override is None:
+                return False
+
+            if override.name not in context.scene.collection.children:
+                context.scene.collection.children.link(override)
+            scene_index().add(override)
+        except (AttributeError, OSError, RuntimeError) as e:
+            logger().error("Failed to link collection: " + collection
+                           + " from: " + file_path + ", " + str(e))
+            return False
+        finally:
+            time_tracker().end("link", collection)
+
+        stat_tracker().update_stat("link_for_collection", collection)
+        return collection in data.collections.keys()
+
+    @staticmethod
+    def load_from_file(file_path: str,
+                       collection: str) -> None:
+        """ Loads the collection from the file with the loader specified in
+            app settings. Linking falls back to appending on failure. """
+
+        if app_settings().collection_loader(collection) == 'link' \
+                and AppendUtility.link_from_file(file_path, collection):
+            return
+
+        AppendUtility.append_from_file(file_path, collection)
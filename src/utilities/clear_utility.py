@@ -2,75 +2,114 @@
     and data.
 """
 
-from bpy import context, data, ops
+from bpy import context, data
 
+from src.classes.scene_index import scene_index
 from src.trackers.stat_tracker import stat_tracker
 from src.trackers.time_tracker import time_tracker
 
 
 class ClearUtility:
     """ This class provides a number of clearing operations.
-        This assists with keeping memory usage down. """
+        This assists with keeping memory usage down. Datablocks are removed
+        in bulk, which is much faster than removing them one at a time. """
+
+    @staticmethod
+    def orphan_collections() -> list:
+        """ Returns the blend data collections that are checked for orphans.
+            These hold the data brought in by each append. """
+
+        return [data.meshes, data.materials, data.images, data.node_groups,
+                data.textures, data.curves]
+
+    @staticmethod
+    def datablock_counts() -> dict:
+        """ Returns the number of datablocks of each type in the blend data. """
+
+        return {'objects': len(data.objects),
+                'collections': len(data.collections),
+                'meshes': len(data.meshes),
+                'materials': len(data.materials),
+                'images': len(data.images),
+                'node_groups': len(data.node_groups),
+                'libraries': len(data.libraries)}
+
+    @staticmethod
+    def purge_orphans() -> int:
+        """ Removes the local datablocks that are no longer used. Removing
+            a datablock can orphan the datablocks it used, so this repeats
+            until there are none left. Linked datablocks are kept so that
+            their libraries can be reused. Returns the number removed. """
+
+        time_tracker().start("purge_orphans")
+
+        removed = 0
+        while True:
+            orphans = [datablock
+                       for datablocks in ClearUtility.orphan_collections()
+                       for datablock in datablocks
+                       if datablock.users == 0 and datablock.library is None]
+            if not orphans:
+                break
+
+            data.batch_remove(ids=orphans)
+            removed += len(orphans)
+
+        time_tracker().end("purge_orphans")
+        return removed
 
     @staticmethod
     def clear_linked_libraries() -> None:
         """ Clears any linked libraries. """
 
-        for lib in data.libraries:
-            data.batch_remove(ids=(lib,))
+        data.batch_remove(ids=list(data.libraries))
 
     @staticmethod
     def clear_materials() -> None:
         """ Clears all materials. """
 
-        for material in data.materials:
-            data.materials.remove(material)
+        data.batch_remove(ids=list(data.materials))
 
     @staticmethod
     def clear_meshes() -> None:
         """ Clears all meshes. """
 
-        for mesh in data.meshes:
-            data.meshes.remove(mesh)
+        data.batch_remove(ids=list(data.meshes))
 
     @staticmethod
     def clear_objects() -> None:
         """ Clears all objects except for the camera. """
 
-        for obj in context.scene.objects:
-            obj.select_set(obj.type != 'CAMERA')
-
-        ops.object.delete()
+        data.batch_remove(ids=[obj for obj in context.scene.objects
+                               if obj.type != 'CAMERA'])
 
     @staticmethod
     def clear_collection(collection: str) -> None:
-        """ Clears all from a collection excluding the camera. """
-
-        time_tracker().start("clear_all", collection)
+        """ Clears all from a collection excluding the camera, then removes
+            the data that was only used by the collection. """
 
-        if collection in data.collections.keys():
-            objs_to_remove = list()
-            collection_data = data.collections.get(collection)
-            if collection_data is not None:
-                for obj in collection_data.all_objects:
-                    if obj.name in data.objects and obj.type != 'CAMERA':
-                        objs_to_remove.append(obj)
+        time_tracker().start("clear_collection", collection)
 
-            # removal of objects needs to be performed
-            # separately from the iteration above to
-            # prevent an internal Blender crash
-            for obj in objs_to_remove:
-                data.objects.remove(obj, do_unlink=True)
+        collection_data = data.collections.get(collection)
+        if collection_data is not None:
+            scene_index().remove(collection)
+            # the objects and the collection are gathered before removing
+            # anything to prevent an internal Blender crash
+            datablocks = [obj for obj in collection_data.all_objects
+                          if obj.name in data.objects and obj.type != 'CAMERA']
+            datablocks.append(collection_data)
+            data.batch_remove(ids=datablocks)
 
-            data.collections.remove(data.collections[collection])
+        time_tracker().end("clear_collection", collection)
 
-        time_tracker().end("clear_all", collection)
+        if collection_data is not None:
+            ClearUtility.purge_orphans()
 
     @staticmethod
     def clear_all_collections() -> None:
         """ Clears all collections. """
 
-        for collection in data.collections:
+        for collection in list(data.collections):
             ClearUtility.clear_collection(collection.name)
 
     @staticmethod
@@ -84,6 +123,7 @@ class ClearUtility:
         ClearUtility.clear_meshes()
         ClearUtility.clear_all_collections()
         ClearUtility.clear_linked_libraries()
+        scene_index().reset()
 
-        time_tracker().start("clear_all")
+        time_tracker().end("clear_all")
         stat_tracker().update_stat("clear_all")
@@ -0,0 +1,73 @@
+""" This utility class computes the material combinations specified in
+    the app settings.
+"""
+
+from collections.abc import Sequence
+
+from src.classes.combination_space import CombinationSpace
+from src.classes.exceptions import InvalidConfigurationException, \
+    InvalidMaterialException
+from src.parsers.settings_parser import app_settings
+
+
+class CombinationUtility:
+    """ This class provides the material combination operations. """
+
+    class Names(Sequence):
+        """ This class is used to index the file name components of the
+            material combinations without computing all of them. """
+
+        def __init__(self,
+                     material_combinations: CombinationSpace) -> None:
+            self._material_combinations = material_combinations
+
+        def __len__(self) -> int:
+            return len(self._material_combinations)
+
+        def __getitem__(self,
+                        index: int) -> str:
+            return CombinationUtility.combination_name(
+                self._material_combinations[index]
+            )
+
+    @staticmethod
+    def specified_combos(combos: list,
+                         combo_length: int) -> list:
+        """ Each specified material is applied to the
+            collection that aligns with it in priority order"""
+
+        if combo_length < len(app_settings().collections()):
+            raise InvalidMaterialException(
+                "Insufficient specified materials for material_combinations, "
+                "expected: f{len(app_settings().collections())}, "
+                "got: f{combo_length}")
+
+        return combos
+
+    @staticmethod
+    def material_combinations(combo_length: int) -> CombinationSpace:
+        """ Returns the material combinations based on the combinatorial
+            type provided. The combinations are computed as they are
+            indexed rather than up front. """
+
+        combinatorial_type = app_settings().parameters().combinatorial_type()
+        if combinatorial_type not in CombinationSpace.TYPES:
+            raise InvalidConfigurationException("Invalid combinatorial type: "
+                                                + str(combinatorial_type))
+
+        combos = app_settings().material_combinations()
+        if combinatorial_type == 'specified':
+            combos = CombinationUtility.specified_combos(combos, combo_length)
+
+        return CombinationSpace(combos, combo_length, combinatorial_type)
+
+    @staticmethod
+    def combination_name(material_combo: tuple) -> str:
+        """ Returns the file name component for a material combination. """
+
+        accounted = set()
+        # we don't want to output the same material name twice, this handles duplicates
+        duplicates_removed = [component
+                              for component in material_combo
+                              if not (component in accounted or accounted.add(component))]
+        return '_'.join(duplicates_removed)
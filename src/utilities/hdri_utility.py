@@ -0,0 +1,44 @@
+""" This utility class writes the variants of the hdri variants cache.
+"""
+
+from os import makedirs, path
+
+from bpy import context, data
+
+
+class HDRIUtility:
+    """ This class provides the hdri variant operations. """
+
+    @staticmethod
+    def write_variant(hdri_path: str,
+                      variant_path: str,
+                      width: int,
+                      half_float: bool) -> None:
+        """ Writes the provided hdri downsampled to the target width, keeping
+            its aspect ratio, as an OpenEXR file. Hdris that are already
+            narrower than the target keep their resolution. The scene's
+            image settings are restored afterwards. """
+
+        image = data.images.load(hdri_path)
+        image_settings = context.scene.render.image_settings
+        settings = (image_settings.file_format, image_settings.color_depth,
+                    image_settings.exr_codec)
+        try:
+            source_width, source_height = image.size
+            if source_width > width:
+                image.scale(width, max(round(source_height * width
+                                             / source_width), 1))
+
+            # OpenEXR files are written linear, without the view transform
+            image_settings.file_format = 'OPEN_EXR'
+            image_settings.color_depth = '16' if half_float else '32'
+            image_settings.exr_codec = 'ZIP'
+            makedirs(path.dirname(variant_path), exist_ok=True)
+            image.save_render(variant_path, scene=context.scene)
+        finally:
+            data.images.remove(image)
+            # the codec is restored while the format is still OpenEXR, and
+            # the depth once the format accepts it again
+            image_settings.exr_codec = settings[2]
+            image_settings.file_format = settings[0]
+            image_settings.color_depth = settings[1]
@@ -0,0 +1,69 @@
+""" This utility class scans Blender files for the asset index.
+"""
+
+from typing import Optional
+
+from bpy import data
+from mathutils import Vector
+
+from src.parsers.settings_parser import app_settings
+from src.utilities.clear_utility import ClearUtility
+from src.utilities.material_utility import MaterialUtility
+
+
+class IndexUtility:
+    """ This class provides the scanning operations. Collections are linked
+        rather than appended, so nothing is copied into the scene. """
+
+    @staticmethod
+    def bounding_box(objects: list) -> Optional[list]:
+        """ Returns the [min, max] corners of the world space bounding box
+            of the provided objects, None when there are no objects. """
+
+        corners = [obj.matrix_world @ Vector(corner)
+                   for obj in objects for corner in obj.bound_box]
+        if not corners:
+            return None
+
+        return [[min(corner[axis] for corner in corners) for axis in range(3)],
+                [max(corner[axis] for corner in corners) for axis in range(3)]]
+
+    @staticmethod
+    def scan_file(file_path: str,
+                  collection: str) -> dict:
+        """ Returns the metadata of the provided file's collection. A file
+            in the material collection is valid when it has materials. """
+
+        is_material_collection = \
+            collection == app_settings().material_collection()
+        used_names = MaterialUtility.used_material_names(file_path) \
+            if is_material_collection else set()
+        with data.libraries.load(file_path, link=True) \
+                as (data_from, data_to):
+            # material files provide the materials their meshes use, the
+            # other files list all of their materials
+            materials = [name for name in data_from.materials
+                         if not is_material_collection or name in used_names]
+            valid = bool(materials) if is_material_collection \
+                else collection in data_from.collections
+            if valid and not is_material_collection:
+                data_to.collections = [collection]
+
+        metadata = {'valid': valid,
+                    'object_count': 0,
+                    'polygon_count': 0,
+                    'materials': materials,
+                    'bounding_box': None}
+        linked = data_to.collections[0] \
+            if not is_material_collection and data_to.collections else None
+        if linked is not None:
+            objects = list(linked.all_objects)
+            metadata['object_count'] = len(objects)
+            metadata['polygon_count'] = sum(len(obj.data.polygons)
+                                            for obj in objects
+                                            if obj.type == 'MESH')
+            metadata['bounding_box'] = IndexUtility.bounding_box(objects)
+
+        # only the metadata is kept
+        ClearUtility.clear_linked_libraries()
+        return metadata
@@ -1,74 +1,272 @@
 """ This utility class handles materials and related operations.
 """
 
-from bpy import data
+from bpy import context, data, ops, types
+from hashlib import sha1
 from typing import Any
 
 from src.parsers.settings_parser import app_settings
+from src.trackers.logger import logger
+from src.trackers.slim_cache import slim_cache
+from src.trackers.stat_tracker import stat_tracker
 from src.trackers.time_tracker import time_tracker
-from src.utilities.append_utility import AppendUtility
 
 
 class MaterialUtility:
     """ This class provides a number of material operations. """
 
+    # material settings that change a material's appearance
+    FINGERPRINT_SETTINGS = ('diffuse_color', 'metallic', 'roughness',
+                            'blend_method', 'shadow_method', 'pass_index')
+    # decimal places of the values compared by the fingerprint
+    FINGERPRINT_PRECISION = 6
+    # nesting of the structs compared by the fingerprint
+    FINGERPRINT_DEPTH = 3
+    # maps the name of each loaded material to the file it was loaded from
+    source_files = dict()
+
     @staticmethod
-    def aggregate_materials(material_collection: str) -> list:
-        """ Finds all materials in the specified collection. """
+    def assign_material(materials: Any,
+                        target_material: Any) -> bool:
+        """ Makes the target material the only material of the provided
+            mesh data materials. The first slot is reused rather than
+            clearing and appending. Returns whether a slot was written. """
 
-        time_tracker().start("get_materials")
+        written = False
+        if len(materials) == 0:
+            materials.append(target_material)
+            written = True
+        elif materials[0] != target_material:
+            materials[0] = target_material
+            written = True
 
-        materials = list()
-        # retrieves all materials on meshes
-        if material_collection in data.collections:
-            for obj in data.collections[material_collection].all_objects:
-                if obj.type == 'MESH':
-                    materials.extend(obj.data.materials)
+        while len(materials) > 1:
+            materials.pop()
+            written = True
 
-        time_tracker().end("get_materials")
-        return materials
+        return written
 
     @staticmethod
     def update_meshes_with_material(meshes: set,
                                     target_material: Any) -> None:
-        """ Updates the provides meshes with the target material. """
+        """ Updates the provides meshes with the target material. Mesh data
+            shared by several meshes is updated once, and slots that already
+            hold the target material are left untouched so Blender keeps its
+            shader and depsgraph caches. """
 
         time_tracker().start("update_meshes")
 
+        avoided = 0
+        updated = set()
         for mesh in meshes:
-            # clear all previous materials and add this new material
-            mesh.data.materials.clear()
-            mesh.data.materials.append(target_material)
+            # linked mesh data is read only and shared with the library,
+            # so the material is assigned through the object's slots
+            if mesh.data.library is not None:
+                if len(mesh.material_slots) == 0:
+                    # the linked data has no slots to assign through, so
+                    # the object is given a slot of its own
+                    with context.temp_override(object=mesh,
+                                               active_object=mesh):
+                        ops.object.material_slot_add()
+
+                for material_slot in mesh.material_slots:
+                    if material_slot.link == 'OBJECT' \
+                            and material_slot.material == target_material:
+                        avoided += 1
+                        continue
+
+                    material_slot.link = 'OBJECT'
+                    material_slot.material = target_material
+                continue
+
+            # a slot linked to the object would hide the reused data slot
+            for material_slot in mesh.material_slots:
+                if material_slot.link == 'OBJECT':
+                    material_slot.link = 'DATA'
+
+            if mesh.data.name in updated:
+                avoided += 1
+                continue
+
+            updated.add(mesh.data.name)
+            if not MaterialUtility.assign_material(mesh.data.materials,
+                                                   target_material):
+                avoided += 1
 
         time_tracker().end("update_meshes")
+        if avoided > 0:
+            stat_tracker().update_stat("avoided_slot_writes", count=avoided)
+
+    @staticmethod
+    def used_material_names(file_path: str) -> set:
+        """ Returns the names of the materials used by the meshes in the
+            provided file's material collection. The collection is linked
+            rather than appended, so nothing is copied into the scene. """
+
+        collection = app_settings().material_collection()
+        libraries = set(data.libraries)
+        with data.libraries.load(file_path, link=True) \
+                as (data_from, data_to):
+            if collection in data_from.collections:
+                data_to.collections = [collection]
+
+        names = set()
+        for linked in data_to.collections:
+            if linked is None:
+                continue
+
+            for obj in linked.all_objects:
+                if obj.type == 'MESH':
+                    names.update(material.name
+                                 for material in obj.data.materials
+                                 if material is not None)
+
+        # only the names are kept
+        data.batch_remove(ids=[library for library in data.libraries
+                               if library not in libraries])
+        return names
+
+    @staticmethod
+    def load_materials(file_path: str) -> list:
+        """ Loads only the material datablocks used by the meshes in the
+            provided file's material collection, no objects or meshes are
+            loaded. A slim file only holds those materials. """
+
+        source_path = slim_cache().resolve(file_path)
+        names = None if source_path != file_path \
+            else MaterialUtility.used_material_names(file_path)
+        with data.libraries.load(source_path, link=False) \
+                as (data_from, data_to):
+            data_to.materials = [name for name in data_from.materials
+                                 if names is None or name in names]
+
+        materials = [material for material in data_to.materials
+                     if material is not None]
+        for material in materials:
+            # nothing uses the materials until they are assigned, so keep
+            # them from being purged as orphan data
+            material.use_fake_user = True
+            MaterialUtility.source_files[material.name] = file_path
+
+        stat_tracker().update_stat("append_for_collection",
+                                   app_settings().material_collection())
+        return materials
 
     @staticmethod
     def get_materials(files: dict) -> list:
-        """ Gets all of the materials specified. """
+        """ Gets all of the materials specified. Each file in the material
+            collection is opened once and only its materials are loaded. """
+
+        time_tracker().start("get_materials")
 
-        # retrieve all materials from all files in the materials collection
+        materials = list()
         for file in files[app_settings().material_collection()]:
-            AppendUtility.append_from_file(
-                file,
-                app_settings().material_collection()
-            )
+            materials.extend(MaterialUtility.load_materials(file))
+
+        time_tracker().end("get_materials")
+        return materials
+
+    @staticmethod
+    def socket_value(value: Any,
+                     depth: int = 0) -> Any:
+        """ Returns a comparable form of a node property or socket value.
+            Values that cannot be compared are described by their address,
+            so materials using them are never merged. """
 
-        # find all of the specific materials across all objects
-        return MaterialUtility.aggregate_materials(
-            app_settings().material_collection()
-        )
+        if isinstance(value, float):
+            return round(value, MaterialUtility.FINGERPRINT_PRECISION)
+        if isinstance(value, (bool, int, str)) or value is None:
+            return value
+        if hasattr(value, 'users') and hasattr(value, 'name'):
+            # datablocks such as images and node groups compare by name
+            return 'ID:' + value.name
+        if depth >= MaterialUtility.FINGERPRINT_DEPTH:
+            return str(value)
+        if hasattr(value, '__iter__'):
+            # arrays and collections compare by their items
+            return tuple(MaterialUtility.socket_value(item, depth + 1)
+                         for item in value)
+        if hasattr(value, 'bl_rna'):
+            # structs such as color ramps compare by their properties
+            return tuple((prop.identifier, MaterialUtility.socket_value(
+                getattr(value, prop.identifier, None), depth + 1))
+                for prop in value.bl_rna.properties
+                if prop.identifier != 'rna_type')
+
+        return str(value)
+
+    @staticmethod
+    def fingerprint(material: Any) -> str:
+        """ Returns a fingerprint of the provided material's appearance. The
+            node tree is described by its node types, properties, unlinked
+            input values and links, so materials that only differ by name
+            have the same fingerprint. """
+
+        description = [MaterialUtility.socket_value(
+            getattr(material, setting, None))
+            for setting in MaterialUtility.FINGERPRINT_SETTINGS]
+        if material.use_nodes and material.node_tree is not None:
+            base_properties = {prop.identifier for prop
+                               in types.Node.bl_rna.properties}
+            for node in sorted(material.node_tree.nodes,
+                               key=lambda node: node.name):
+                description.append((
+                    node.name, node.bl_idname,
+                    [(prop.identifier, MaterialUtility.socket_value(
+                        getattr(node, prop.identifier, None)))
+                     for prop in node.bl_rna.properties
+                     if prop.identifier not in base_properties],
+                    [(socket.identifier,
+                      MaterialUtility.socket_value(socket.default_value))
+                     for socket in node.inputs
+                     if not socket.is_linked
+                     and hasattr(socket, 'default_value')]
+                ))
+
+            description.extend(sorted(
+                (link.from_node.name, link.from_socket.identifier,
+                 link.to_node.name, link.to_socket.identifier)
+                for link in material.node_tree.links
+            ))
+
+        return sha1(repr(description).encode()).hexdigest()
+
+    @staticmethod
+    def deduplicate_materials(materials: list) -> list:
+        """ Removes the materials that are the same datablock as, or look
+            the same as, an earlier material. Returns the kept materials and
+            reports what was merged. """
+
+        time_tracker().start("deduplicate_materials")
+
+        kept = list()
+        kept_by_fingerprint = dict()
+        seen = set()
+        for material in materials:
+            if material.name in seen:
+                # the same datablock was provided more than once
+                continue
+
+            seen.add(material.name)
+            fingerprint = MaterialUtility.fingerprint(material)
+            if fingerprint not in kept_by_fingerprint:
+                kept_by_fingerprint[fingerprint] = material
+                kept.append(material)
+                continue
+
+            # the merged material keeps its fake user, a persistent worker
+            # provides the same loaded materials to each of its jobs
+            logger().info("Merged material: " + material.name + " into: "
+                          + kept_by_fingerprint[fingerprint].name)
+            stat_tracker().update_stat("merged_materials",
+                                       app_settings().material_collection(),
+                                       kept_by_fingerprint[fingerprint].name)
+
+        time_tracker().end("deduplicate_materials")
+        return kept
 
     @staticmethod
     def get_immaterial_collections() -> list:
         """ Finds all collections that are not specified as material collections. """
 
-        collections = sorted(app_settings().collections().keys())
-        non_material_collections_by_priority = list()
-        for collection in collections:
-            if app_settings().collections()[collection] \
-                    not in app_settings().material_collection():
-                non_material_collections_by_priority.append(
-                    app_settings().collections()[collection]
-                )
-
-        return non_material_collections_by_priority
+        return app_settings().immaterial_collections()
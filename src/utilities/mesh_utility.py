@@ -1,10 +1,10 @@
 """ This utility class handles meshes and related operations.
 """
 
-from bpy import data
 from typing import Any
 
-from src.parsers.settings_parser import app_settings
+from src.classes.collection_cache import collection_cache
+from src.classes.scene_index import scene_index
 from src.trackers.time_tracker import time_tracker
 
 
@@ -28,11 +28,11 @@ class MeshUtility:
 
         time_tracker().start("get_meshes")
 
-        meshes = set()
-        for collection in data.collections:
-            # exclude meshes that are in the material collection
-            if collection.name not in app_settings().material_collection():
-                meshes.update(MeshUtility.meshes_in_collection(collection))
+        # exclude meshes that are in the material collection or in
+        # resident collections that are not part of the scene
+        meshes = scene_index().scene_meshes(
+            collection_cache().inactive_names()
+        )
 
         time_tracker().end("get_meshes")
         return meshes
@@ -42,10 +42,6 @@ class MeshUtility:
         """ Returns all meshes in the specified collection. """
 
         time_tracker().start("get_meshes")
-        meshes = set()
-        for collection in data.collections:
-            if collection.name == collection_name:
-                meshes.update(MeshUtility.meshes_in_collection(collection))
-
+        meshes = scene_index().meshes_in_collection(collection_name)
         time_tracker().end("get_meshes")
         return meshes
@@ -0,0 +1,86 @@
+""" This utility class handles the output files and related operations.
+    This does not depend on Blender so that it can also be used
+    when planning.
+"""
+
+from os import path, scandir
+
+from src.parsers.settings_parser import app_settings, blender_settings
+
+
+class OutputUtility:
+    """ This class provides output file operations. """
+
+    # names of the files in the output directory, scanned once per run
+    _output_files = None
+
+    @staticmethod
+    def clear() -> None:
+        """ Drops the output directory files, the output directory is
+            scanned again on next use. """
+
+        OutputUtility._output_files = None
+
+    @staticmethod
+    def image_components() -> list:
+        """ Returns the file name components for the image settings. """
+
+        return [blender_settings().image_settings().color_mode().lower(),
+                blender_settings().image_settings().color_depth()]
+
+    @staticmethod
+    def emission_component(emission: float) -> str:
+        """ Returns the file name component for a world emission. """
+
+        return 'em' + str(emission)
+
+    @staticmethod
+    def hdri_component(hdri_path: str) -> str:
+        """ Returns the file name component for a world hdri. """
+
+        return str(path.split(hdri_path)[-1])
+
+    @staticmethod
+    def exposure_component(exposure: float) -> str:
+        """ Returns the file name component for a view exposure. """
+
+        return 'exp' + str(exposure)
+
+    @staticmethod
+    def file_name_for_components(file_components: list) -> str:
+        """ Returns a file name for the provided components. """
+
+        file_name = '_'.join(file_components)
+        file_name += '.' \
+                     + blender_settings().image_settings().file_format().lower()
+        return path.join(app_settings().paths().output_dir_path(), file_name)
+
+    @staticmethod
+    def output_files() -> set:
+        """ Returns the names of the files in the output directory. The
+            output directory is scanned once, rendered files are added as
+            they are written. """
+
+        if OutputUtility._output_files is None:
+            OutputUtility._output_files = set()
+            output_dir = app_settings().paths().output_dir_path()
+            # Blender creates the output directory when rendering to it
+            if path.isdir(output_dir):
+                with scandir(output_dir) as entries:
+                    OutputUtility._output_files = {entry.name
+                                                   for entry in entries
+                                                   if entry.is_file()}
+
+        return OutputUtility._output_files
+
+    @staticmethod
+    def output_exists(file_name: str) -> bool:
+        """ Returns whether the provided file is in the output directory. """
+
+        return path.basename(file_name) in OutputUtility.output_files()
+
+    @staticmethod
+    def add_output(file_name: str) -> None:
+        """ Adds the provided file to the output directory files. """
+
+        OutputUtility.output_files().add(path.basename(file_name))
@@ -5,13 +5,21 @@
 
 from datetime import datetime
 from os import path
+from typing import Iterator, Optional
 
 from src.classes.camera import camera
+from src.classes.iteration_space import IterationSpace
 from src.classes.overseer_dispatcher import overseer_dispatcher
-from src.parsers.settings_parser import app_settings, blender_settings
+from src.parsers.settings_parser import app_settings
 from src.trackers.logger import logger
+from src.trackers.stat_tracker import stat_tracker
+from src.trackers.time_tracker import time_tracker
+from src.utilities.clear_utility import ClearUtility
 from src.utilities.material_utility import MaterialUtility
+from src.utilities.output_utility import OutputUtility
 from src.utilities.render_utility import RenderUtility
+from src.utilities.sample_utility import SampleUtility
+from src.utilities.schedule_utility import ScheduleUtility
 from src.utilities.validation_utility import ValidationUtility
 
 
@@ -25,8 +33,24 @@ class OverseerUtility:
         self._files = ValidationUtility.validate_files(files)
         self.total_iterations_to_execute = 0
         self.create_overseers()
+        self._space = IterationSpace(
+            [(overseer.axis_name(), range(overseer.iteration_count()))
+             for overseer in self._overseers]
+        )
+        self._schedule = None
+        self._transitions = 0
         self._count = 0
 
+    def materials(self) -> list:
+        """ Returns the materials applied by the material overseer, after
+            any duplicate materials were merged. """
+
+        for overseer in self._overseers:
+            if overseer.axis_kind == 'material':
+                return overseer.materials()
+
+        return self._materials
+
     def create_overseer(self,
                         overseer_type,
                         **kwargs) -> None:
@@ -60,20 +84,218 @@ class OverseerUtility:
                                  collection=collection,
                                  files=self._files[collection])
 
+    def states_for_iteration(self,
+                             iteration: int) -> list:
+        """ Returns the state of each overseer for the provided iteration.
+            The states are the digits of the iteration in the mixed radix
+            formed by the overseers' iteration counts. """
+
+        return [overseer.state_for_iteration(iteration)
+                for overseer in self._overseers]
+
+    def components_for_states(self,
+                              states: list) -> list:
+        """ Returns the file name components for the provided overseer
+            states, along with the image settings components. """
+
+        components = [overseer.component_for_state(state)
+                      for overseer, state in zip(self._overseers, states)]
+        components.extend(OutputUtility.image_components())
+        return components
+
+    def file_name_for_iteration(self,
+                                iteration: int) -> str:
+        """ Returns the output file name for the provided iteration without
+            applying any of the overseers' states. """
+
+        return RenderUtility.file_name_for_components(
+            self.components_for_states(self.states_for_iteration(iteration))
+        )
+
+    def schedule_axes(self) -> list:
+        """ Returns the schedule axis for each of the overseers. """
+
+        axes = list()
+        for overseer in self._overseers:
+            # collections are predicted from the cost of each file
+            assets = None
+            if overseer.axis_kind == 'collection':
+                assets = [overseer.component_for_state(state)
+                          for state in range(overseer.iteration_count())]
+
+            axes.append(ScheduleUtility.Axis(
+                overseer.axis_name(),
+                overseer.iteration_count(),
+                ScheduleUtility.DEFAULT_COSTS.get(overseer.axis_kind, 0.0),
+                overseer.modifies_scene,
+                overseer.depends_on_scene,
+                assets
+            ))
+
+        return axes
+
+    def schedule(self) -> ScheduleUtility.Schedule:
+        """ Returns the traversal of the overseers specified in the
+            settings along with its prediction. The scheduled traversal
+            order selects the nesting and traversal order with the lowest
+            predicted cost. """
+
+        axes = self.schedule_axes()
+        traversal_order = app_settings().parameters().traversal_order()
+        if traversal_order == 'scheduled':
+            return ScheduleUtility.schedule(axes)
+
+        return ScheduleUtility.predict(axes, traversal_order,
+                                       list(range(len(axes))))
+
+    def is_rendered(self,
+                    iteration: int) -> bool:
+        """ Returns whether the output of the provided iteration already
+            exists, the iteration is counted as skipped if so. """
+
+        if not OutputUtility.output_exists(
+                self.file_name_for_iteration(iteration)):
+            return False
+
+        stat_tracker().update_stat("skipped")
+        return True
+
+    def collection_states(self) -> list:
+        """ Returns the current state of each collection overseer, from
+            the outermost. These identify the appended collection files. """
+
+        return [overseer.current_state() for overseer in self._overseers
+                if overseer.axis_kind == 'collection']
+
+    @staticmethod
+    def in_ranges(iteration: int,
+                  iteration_ranges: Optional[list]) -> bool:
+        """ Returns whether the iteration is within one of the provided
+            (start, end) ranges, the end is exclusive. Every iteration is
+            within the ranges when none are provided. """
+
+        return iteration_ranges is None \
+            or any(start <= iteration < end for start, end in iteration_ranges)
+
+    def iterations_to_execute(self,
+                              iteration_ranges: Optional[list] = None,
+                              shard: Optional[tuple] = None) \
+            -> Iterator[int]:
+        """ Yields each iteration that needs to be rendered, in the
+            traversal order specified in the settings. When sampling is
+            enabled, only the sampled iterations are rendered, for a shard
+            only its part of the unsharded sample. Only the
+            iterations within the provided ranges are rendered when
+            provided.
+            Iterations whose output already exists are skipped before any
+            scene work unless overwriting is enabled. """
+
+        overwrite = app_settings().parameters().overwrite()
+        self._schedule = self.schedule()
+        if app_settings().parameters().sampling_enabled():
+            # only the sample is rendered, grouped by the outermost axes
+            iterations = SampleUtility.sample(self._space,
+                                              self._schedule.nesting(),
+                                              shard)
+            self.total_iterations_to_execute = len(iterations)
+        else:
+            iterations = self._space.iterations(
+                self._schedule.traversal_order(), self._schedule.nesting()
+            )
+        for position, iteration in enumerate(iterations):
+            if not OverseerUtility.in_ranges(iteration, iteration_ranges):
+                continue
+
+            if not overwrite and self.is_rendered(iteration):
+                continue
+
+            # the render count reports the position in the traversal
+            self._count = position
+            yield iteration
+
+    def iterations_for_files(self,
+                             file_paths: list) -> Iterator[int]:
+        """ Yields each iteration that uses any of the provided collection
+            or material files, grouped by file. Only these iterations are
+            enumerated, the rest of the render space is never visited. """
+
+        yielded = set()
+        for axis, overseer in enumerate(self._overseers):
+            if overseer.axis_kind not in ['collection', 'material']:
+                continue
+
+            # the space of every other overseer, for each of the file states
+            other_axes = [other for other in range(len(self._overseers))
+                          if other != axis]
+            other_space = IterationSpace(
+                [(self._space.names()[other],
+                  range(self._space.radices()[other]))
+                 for other in other_axes]
+            )
+            for state in overseer.states_for_files(file_paths):
+                for other_iteration in other_space.odometer_iterations():
+                    states = other_space.states_for_iteration(other_iteration)
+                    states.insert(axis, state)
+                    iteration = self._space.iteration_for_states(states)
+                    if iteration not in yielded:
+                        yielded.add(iteration)
+                        yield iteration
+
+    def seek(self,
+             iteration: int) -> None:
+        """ Moves each of the overseers directly to their state for the
+            provided iteration. Only the overseers whose state changes are
+            applied, along with those that depend on replaced objects. """
+
+        scene_modified = False
+        for overseer in self._overseers:
+            if overseer.seek(iteration,
+                             scene_modified and overseer.depends_on_scene):
+                scene_modified |= overseer.modifies_scene
+                self._transitions += 1
+
+    def execute(self,
+                iteration: int) -> str:
+        """ Seeks to the provided iteration and executes the rendering.
+            Returns the rendered file path. """
+
+        self.seek(iteration)
+        return self.render()
+
+    def report_schedule(self) -> None:
+        """ Reports the predicted and the actual transitions. """
+
+        if self._schedule is None:
+            return
+
+        logger().info("------------- Execution Schedule -------------")
+        logger().info("Traversal: " + self._schedule.traversal_order()
+                      + ", Nesting: " + ', '.join(
+                          [self._overseers[axis].axis_name()
+                           for axis in self._schedule.nesting()]))
+        logger().info("Predicted transitions: "
+                      + str(self._schedule.transitions())
+                      + ", Time: "
+                      + "{0:.2f}".format(self._schedule.cost()))
+        logger().info("Actual transitions: " + str(self._transitions)
+                      + ", Time: "
+                      + "{0:.2f}".format(time_tracker().elapsed("transition")))
+
     def update(self) -> None:
         """ Updates each of the overseers and executes the rendering. """
 
         # call into each sub overseer and execute their update
         # on each iteration
         [overseer.update() for overseer in self._overseers]
+        self.render()
+
+    def render(self) -> str:
+        """ Renders the scene for the overseers' current states.
+            Returns the rendered file path. """
 
         # grab the components from the overseers and the settings for the file name
-        components = [str(overseer) for overseer in self._overseers]
-        components.append(
-            blender_settings().image_settings().color_mode().lower()
-        )
-        components.append(
-            blender_settings().image_settings().color_depth()
+        components = self.components_for_states(
+            [overseer.current_state() for overseer in self._overseers]
         )
         # update the camera's perspective and align
         camera().set_camera_to_perspective(
@@ -81,10 +303,15 @@ class OverseerUtility:
         )
         camera().align_camera_to_active_objects()
         self._count += 1
-        filename = path.split(RenderUtility.file_name_for_components(components))[-1]
+        file_path = RenderUtility.file_name_for_components(components)
         logger().info("Render " + str(self._count)
                       + " out of " + str(self.total_iterations_to_execute)
-                      + ": " + filename
+                      + ": " + path.split(file_path)[-1]
                       + " @ " + str(datetime.now().strftime("%H:%M:%S")))
         # use the render utility to render the scene
         RenderUtility.render_file(components)
+        if app_settings().parameters().datablock_report_enabled():
+            logger().info("Datablocks: " + ', '.join(
+                [datablock_type + ": " + str(count) for datablock_type, count
+                 in ClearUtility.datablock_counts().items()]))
+        return file_path
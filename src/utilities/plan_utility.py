@@ -0,0 +1,246 @@
+""" This utility class builds the render plan. The plan enumerates
+    everything that will be rendered without executing Blender.
+"""
+
+from csv import writer
+from json import dumps
+from os import path
+from typing import Iterator, Sequence, TextIO
+
+from src.classes.iteration_space import IterationSpace
+from src.parsers.settings_parser import app_settings, blender_settings
+from src.trackers.asset_index import asset_index, has_asset_index
+from src.utilities.clean_utility import CleanUtility
+from src.utilities.combination_utility import CombinationUtility
+from src.utilities.output_utility import OutputUtility
+from src.utilities.sample_utility import SampleUtility
+from src.utilities.schedule_utility import ScheduleUtility
+from src.utilities.validation_utility import ValidationUtility
+
+
+class PlanUtility:
+    """ This class provides the planning operations. The iteration space
+        mirrors the overseers created by the OverseerUtility. """
+
+    @staticmethod
+    def material_entries(files: dict) -> list:
+        """ Returns the asset index entries of the valid material files,
+            None for each file that is not indexed. """
+
+        material_files = ValidationUtility.validate_files(files)[
+            app_settings().material_collection()
+        ]
+        if not has_asset_index():
+            return [None] * len(material_files)
+
+        return [asset_index().entry(file) for file in material_files]
+
+    @staticmethod
+    def materials_merged() -> bool:
+        """ Returns whether Blender merges the materials that look the
+            same. The planner does not open the material files, so it
+            still counts the merged materials. """
+
+        return app_settings().parameters().material_dedup_enabled() \
+            and not (app_settings().parameters().enable_material_combinations()
+                     and app_settings().material_combinations() is not None)
+
+    @staticmethod
+    def materials_known(files: dict) -> bool:
+        """ Returns whether the material components are the names of the
+            materials Blender loads, which is the case for material
+            combinations or when every material file is indexed. """
+
+        if app_settings().parameters().enable_material_combinations() \
+                and app_settings().material_combinations() is not None:
+            return True
+
+        return None not in PlanUtility.material_entries(files)
+
+    @staticmethod
+    def loaded_names(names: list) -> list:
+        """ Returns the provided datablock names as Blender names them when
+            they are loaded in order. A name that is already used is given
+            the lowest free numeric suffix, e.g. `gold` becomes `gold.001`. """
+
+        loaded = list()
+        used = set()
+        for name in names:
+            if name in used:
+                base, _, number = name.rpartition('.')
+                if not (base and number.isdigit()):
+                    base = name
+
+                suffix = 1
+                while base + '.' + format(suffix, '03d') in used:
+                    suffix += 1
+                name = base + '.' + format(suffix, '03d')
+
+            used.add(name)
+            loaded.append(name)
+
+        return loaded
+
+    @staticmethod
+    def material_components(files: dict) -> Sequence:
+        """ Returns the material components. Material names are stored
+            inside the Blender files, they are read from the asset index
+            when every material file is indexed. Otherwise each material
+            file is expected to provide a material named after it. """
+
+        if app_settings().parameters().enable_material_combinations() \
+                and app_settings().material_combinations() is not None:
+            return CombinationUtility.Names(
+                CombinationUtility.material_combinations(
+                    len(app_settings().immaterial_collections())
+                )
+            )
+
+        material_collection = app_settings().material_collection()
+        entries = PlanUtility.material_entries(files)
+        if None not in entries:
+            # the materials are loaded in the same order as indexed, and
+            # the index holds the names stored in each file
+            return CleanUtility.cleanup_other_components(
+                ValidationUtility.validate_components(
+                    PlanUtility.loaded_names(
+                        [material for entry in entries
+                         for material in entry['materials']]
+                    ),
+                    material_collection
+                )
+            )
+
+        return CleanUtility.cleanup_file_components(
+            ValidationUtility.validate_files(files)[material_collection]
+        )
+
+    @staticmethod
+    def world_components() -> list:
+        """ Returns the world components. """
+
+        background_settings = blender_settings().background_settings()
+        if background_settings.hdri_enabled():
+            return [OutputUtility.hdri_component(hdri)
+                    for hdri in background_settings.hdris()]
+        if background_settings.emission_variability_enabled():
+            return [OutputUtility.emission_component(emission)
+                    for emission in background_settings.emissions()]
+
+        return [OutputUtility.emission_component(
+            background_settings.default_emission()
+        )]
+
+    @staticmethod
+    def view_components() -> list:
+        """ Returns the view components. """
+
+        view_settings = blender_settings().view_settings()
+        if view_settings.exposure_variability_enabled():
+            return [OutputUtility.exposure_component(exposure)
+                    for exposure in view_settings.exposures()]
+
+        return [OutputUtility.exposure_component(
+            view_settings.default_exposure()
+        )]
+
+    @staticmethod
+    def create_space(files: dict) -> IterationSpace:
+        """ Creates the iteration space for the provided files, ordered
+            the same as the overseers. """
+
+        validated_files = ValidationUtility.validate_files(files)
+        axes = list()
+        for collection in app_settings().immaterial_collections():
+            axes.append((collection, CleanUtility.cleanup_file_components(
+                validated_files[collection]
+            )))
+
+        axes.append(('material', PlanUtility.material_components(files)))
+        axes.append(('world', PlanUtility.world_components()))
+        axes.append(('view', PlanUtility.view_components()))
+        return IterationSpace(axes)
+
+    @staticmethod
+    def schedule(space: IterationSpace) -> ScheduleUtility.Schedule:
+        """ Returns the traversal of the space specified in the settings,
+            scheduled the same as the OverseerUtility. """
+
+        collections = app_settings().immaterial_collections()
+        axes = list()
+        for name, radix in zip(space.names(), space.radices()):
+            kind = 'collection' if name in collections else name
+            assets = None
+            if kind == 'collection':
+                assets = space.components_for_axis(name)
+
+            axes.append(ScheduleUtility.Axis(
+                name, radix, ScheduleUtility.DEFAULT_COSTS[kind],
+                kind == 'collection', kind == 'material', assets
+            ))
+
+        traversal_order = app_settings().parameters().traversal_order()
+        if traversal_order == 'scheduled':
+            return ScheduleUtility.schedule(axes)
+
+        return ScheduleUtility.predict(axes, traversal_order,
+                                       list(range(len(axes))))
+
+    @staticmethod
+    def plan(space: IterationSpace) -> Iterator[dict]:
+        """ Yields each planned render in the traversal order specified
+            in the settings. Renders whose output already exists are
+            skipped unless overwriting is enabled. """
+
+        overwrite = app_settings().parameters().overwrite()
+        schedule = PlanUtility.schedule(space)
+        iterations = space.iterations(schedule.traversal_order(),
+                                      schedule.nesting())
+        if app_settings().parameters().sampling_enabled():
+            iterations = SampleUtility.sample(space, schedule.nesting())
+
+        previous_states = None
+        for iteration in iterations:
+            states = space.states_for_iteration(iteration)
+            components = space.components_for_states(states)
+            file_name = OutputUtility.file_name_for_components(
+                components + OutputUtility.image_components()
+            )
+            if not overwrite and OutputUtility.output_exists(file_name):
+                continue
+
+            yield {'iteration': iteration,
+                   'components': components,
+                   'file_name': path.split(file_name)[-1],
+                   'changes': space.changed_axes(previous_states, states)}
+            previous_states = states
+
+    @staticmethod
+    def write_jsonl(rows: Iterator[dict],
+                    stream: TextIO) -> int:
+        """ Writes each row as a line of json. Returns the row count. """
+
+        count = 0
+        for row in rows:
+            stream.write(dumps(row) + '\n')
+            count += 1
+
+        return count
+
+    @staticmethod
+    def write_csv(space: IterationSpace,
+                  rows: Iterator[dict],
+                  stream: TextIO) -> int:
+        """ Writes each row as a line of csv with a column for each axis.
+            Returns the row count. """
+
+        csv_writer = writer(stream)
+        csv_writer.writerow(['iteration', *space.names(),
+                             'file_name', 'changes'])
+        count = 0
+        for row in rows:
+            csv_writer.writerow([row['iteration'], *row['components'],
+                                 row['file_name'], ' '.join(row['changes'])])
+            count += 1
+
+        return count
@@ -1,39 +1,40 @@
 """ This utility class handles rendering and related operations.
 """
 
-from bpy import context, ops
-from os import path, makedirs
+from bpy import context, data, ops
 
+from src.classes.world import world
 from src.parsers.settings_parser import app_settings, blender_settings
 from src.trackers.logger import logger
 from src.trackers.stat_tracker import stat_tracker
 from src.trackers.time_tracker import time_tracker
+from src.utilities.material_utility import MaterialUtility
+from src.utilities.output_utility import OutputUtility
 
 
 class RenderUtility:
     """ This class provides render operations. """
 
+    # engines that compile a shader for each material on first use
+    SHADER_ENGINES = ('BLENDER_EEVEE', 'BLENDER_EEVEE_NEXT')
+    # resolution of the shader warmup renders
+    WARMUP_RESOLUTION = 32
+    # names of the materials whose shaders are compiled in this process
+    warmed_materials = set()
+
     @staticmethod
     def file_name_for_components(file_components: list) -> str:
         """ Returns a file name for the provided components. """
 
-        file_name = '_'.join(file_components)
-        file_name += '.' \
-                     + blender_settings().image_settings().file_format().lower()
-        file_path = path.join(app_settings().paths().output_dir_path(), file_name)
-
-        # create the output directory if it does not exist
-        if not path.exists(app_settings().paths().output_dir_path()):
-            makedirs(app_settings().paths().output_dir_path())
-
-        return file_path
+        return OutputUtility.file_name_for_components(file_components)
 
     @staticmethod
     def render_file(file_components: list) -> None:
         """ Performs the render for the provided file. """
 
         file_name = RenderUtility.file_name_for_components(file_components)
-        if path.exists(file_name) and not app_settings().parameters().overwrite():
+        if OutputUtility.output_exists(file_name) \
+                and not app_settings().parameters().overwrite():
             logger().info("Already exists, skipping: " + file_name)
             return
 
@@ -41,6 +42,58 @@ class RenderUtility:
         # set the file name for the render and render
         context.scene.render.filepath = file_name
         ops.render.render(write_still=True)
+        OutputUtility.add_output(file_name)
 
         stat_tracker().update_stat("render")
         time_tracker().end("render")
+
+    @staticmethod
+    def warmup(materials: list) -> None:
+        """ Compiles the shaders of the provided materials and of the world
+            before rendering, so the compilation is not part of the render
+            times. Each material is rendered once on a plane at a low
+            resolution. Materials are only compiled once per process. """
+
+        if blender_settings().render_settings().engine() \
+                not in RenderUtility.SHADER_ENGINES \
+                or not app_settings().parameters().shader_warmup_enabled():
+            return
+
+        materials = [material for material in materials
+                     if material.name not in RenderUtility.warmed_materials]
+        if not materials:
+            return
+
+        time_tracker().start("shader_warmup")
+
+        background_settings = blender_settings().background_settings()
+        if background_settings.hdri_enabled() \
+                and background_settings.hdris():
+            # the world shader is compiled with the hdri node in place
+            world().set_hdri(background_settings.hdris()[0])
+
+        render = context.scene.render
+        settings = (render.resolution_x, render.resolution_y,
+                    render.resolution_percentage, render.filepath)
+        render.resolution_x = RenderUtility.WARMUP_RESOLUTION
+        render.resolution_y = RenderUtility.WARMUP_RESOLUTION
+        render.resolution_percentage = 100
+
+        mesh = data.meshes.new('shader_warmup')
+        mesh.from_pydata([(-1, -1, 0), (1, -1, 0), (1, 1, 0), (-1, 1, 0)],
+                         [], [(0, 1, 2, 3)])
+        plane = data.objects.new('shader_warmup', mesh)
+        context.scene.collection.objects.link(plane)
+        try:
+            for material in materials:
+                MaterialUtility.assign_material(mesh.materials, material)
+                ops.render.render(write_still=False)
+                RenderUtility.warmed_materials.add(material.name)
+        finally:
+            data.batch_remove(ids=[plane, mesh])
+            render.resolution_x, render.resolution_y, \
+                render.resolution_percentage, render.filepath = settings
+            time_tracker().end("shader_warmup")
+
+        logger().info("Compiled the shaders of " + str(len(materials))
+                      + " materials")
@@ -0,0 +1,222 @@
+""" This utility class draws samples of the iteration space. A sample is
+    drawn without computing the iterations that are not drawn.
+"""
+
+from random import Random
+from typing import Optional
+
+from src.classes.exceptions import InvalidConfigurationException
+from src.classes.iteration_space import IterationSpace
+from src.parsers.settings_parser import app_settings
+
+
+class SampleUtility:
+    """ This class provides the sampling operations. Each sample is drawn
+        from a seeded generator, so the same settings always draw the same
+        iterations and an interrupted run resumes the same sample. """
+
+    # candidate renders compared for each render of a pairwise sample
+    PAIRWISE_CANDIDATES = 20
+
+    @staticmethod
+    def uniform(space: IterationSpace,
+                count: int,
+                rng: Random) -> list:
+        """ Returns count distinct iterations drawn uniformly. """
+
+        return rng.sample(range(space.total()), min(count, space.total()))
+
+    @staticmethod
+    def stratified(space: IterationSpace,
+                   count: int,
+                   rng: Random) -> list:
+        """ Returns count distinct iterations where each state of each axis
+            is drawn as evenly as possible. Each axis' states are shuffled
+            and repeated, and the axes are then combined at random. """
+
+        count = min(count, space.total())
+        columns = list()
+        for radix in space.radices():
+            column = list()
+            while len(column) < count:
+                column.extend(rng.sample(range(radix), radix))
+            column = column[:count]
+            rng.shuffle(column)
+            columns.append(column)
+
+        iterations = list()
+        drawn = set()
+        for states in zip(*columns):
+            iteration = space.iteration_for_states(list(states))
+            # a combination drawn twice is replaced by a uniform draw
+            while iteration in drawn:
+                iteration = rng.randrange(space.total())
+            drawn.add(iteration)
+            iterations.append(iteration)
+
+        return iterations
+
+    @staticmethod
+    def pair(axis: int,
+             state: int,
+             other: int,
+             other_state: int) -> tuple:
+        """ Returns the pair of the provided states, ordered by axis. """
+
+        if other < axis:
+            return other, other_state, axis, state
+
+        return axis, state, other, other_state
+
+    @staticmethod
+    def pairs(states: list,
+              axes: list) -> set:
+        """ Returns the pairs of the provided states over the provided
+            axes. """
+
+        return {SampleUtility.pair(first, states[first],
+                                   second, states[second])
+                for index, first in enumerate(axes)
+                for second in axes[index + 1:]}
+
+    @staticmethod
+    def pairwise(space: IterationSpace,
+                 count: int,
+                 rng: Random) -> list:
+        """ Returns iterations where every pair of states of every two axes
+            is drawn at least once, a covering array of strength two. Each
+            iteration is built greedily from an uncovered pair, the best of
+            a number of candidates is kept. The sample is topped up with
+            uniform draws when it is smaller than count. """
+
+        radices = space.radices()
+        axes = [axis for axis, radix in enumerate(radices) if radix > 1]
+        pending = [(first, first_state, second, second_state)
+                   for index, first in enumerate(axes)
+                   for second in axes[index + 1:]
+                   for first_state in range(radices[first])
+                   for second_state in range(radices[second])]
+        rng.shuffle(pending)
+        uncovered = set(pending)
+
+        iterations = list()
+        drawn = set()
+        for seed in pending:
+            if seed not in uncovered:
+                continue
+
+            best_states, best_pairs = None, set()
+            for _ in range(SampleUtility.PAIRWISE_CANDIDATES):
+                states = [0] * len(radices)
+                states[seed[0]], states[seed[2]] = seed[1], seed[3]
+                assigned = [seed[0], seed[2]]
+                others = [axis for axis in axes if axis not in assigned]
+                rng.shuffle(others)
+                for axis in others:
+                    # pick the state that covers the most uncovered pairs
+                    # with the axes assigned so far, ties are random
+                    scores = [(sum(SampleUtility.pair(axis, state, other,
+                                                      states[other])
+                                   in uncovered for other in assigned),
+                               rng.random(), state)
+                              for state in range(radices[axis])]
+                    states[axis] = max(scores)[2]
+                    assigned.append(axis)
+
+                covered = SampleUtility.pairs(states, axes) & uncovered
+                if len(covered) > len(best_pairs):
+                    best_states, best_pairs = states, covered
+
+            uncovered -= best_pairs
+            iteration = space.iteration_for_states(best_states)
+            if iteration not in drawn:
+                drawn.add(iteration)
+                iterations.append(iteration)
+
+        if not iterations and space.total() > 0:
+            # every axis has a single state
+            iterations.append(0)
+            drawn.add(0)
+
+        count = min(count, space.total())
+        while len(iterations) < count:
+            iteration = rng.randrange(space.total())
+            if iteration not in drawn:
+                drawn.add(iteration)
+                iterations.append(iteration)
+
+        return iterations
+
+    sampling_map = {
+        'uniform': uniform,
+        'stratified': stratified,
+        'pairwise': pairwise
+    }
+
+    @staticmethod
+    def unsharded_space(space: IterationSpace,
+                        count: int) -> IterationSpace:
+        """ Returns the provided shard's space with count outermost
+            states, the space of every shard together. """
+
+        radices = space.radices()
+        return IterationSpace(
+            [(name, range(count if axis == 0 else radices[axis]))
+             for axis, name in enumerate(space.names())]
+        )
+
+    @staticmethod
+    def shard_iterations(space: IterationSpace,
+                         unsharded_space: IterationSpace,
+                         iterations: list,
+                         start: int) -> list:
+        """ Returns the provided iterations of the unsharded space that are
+            in the shard whose outermost states start at start, as
+            iterations of the shard's space. """
+
+        end = start + space.radices()[0]
+        sharded = list()
+        for iteration in iterations:
+            states = unsharded_space.states_for_iteration(iteration)
+            if start <= states[0] < end:
+                states[0] -= start
+                sharded.append(space.iteration_for_states(states))
+
+        return sharded
+
+    @staticmethod
+    def sample(space: IterationSpace,
+               nesting: Optional[list] = None,
+               shard: Optional[tuple] = None) -> list:
+        """ Returns the sample specified in the settings, ordered by the
+            states of the provided nesting from the outermost axis so that
+            renders using the same collection files are grouped. When the
+            (start, count) of a shard of the outermost axis is provided,
+            the sample is drawn from the unsharded space and only the
+            shard's part is returned, so the shards render the same sample
+            as a single process. """
+
+        sampling = app_settings().parameters().sampling()
+        if sampling not in SampleUtility.sampling_map:
+            raise InvalidConfigurationException("Invalid sampling: "
+                                                + str(sampling))
+
+        drawn_space = space if shard is None \
+            else SampleUtility.unsharded_space(space, shard[1])
+
+        iterations = SampleUtility.sampling_map[sampling](
+            drawn_space,
+            app_settings().parameters().sample_count(),
+            Random(app_settings().parameters().sample_seed())
+        )
+        if shard is not None:
+            iterations = SampleUtility.shard_iterations(space, drawn_space,
+                                                        iterations, shard[0])
+        if nesting is None:
+            nesting = list(range(len(space.names())))
+
+        return sorted(iterations,
+                      key=lambda iteration: [
+                          space.states_for_iteration(iteration)[axis]
+                          for axis in nesting
+                      ])
@@ -0,0 +1,231 @@
+""" This utility class schedules the traversal of the overseers using a
+    cost model fed by the recorded cost history.
+"""
+
+from itertools import islice, permutations
+from typing import Optional
+
+from src.classes.iteration_space import IterationSpace
+from src.trackers.cost_history import cost_history
+
+
+class ScheduleUtility:
+    """ This class provides the scheduling operations. The cost of a
+        traversal is predicted from the number of state transitions of
+        each axis and the recorded time of each transition. """
+
+    # the predicted time in seconds of a transition for each kind of axis,
+    # used until the transitions of an axis have been recorded
+    DEFAULT_COSTS = {
+        'collection': 1.0,
+        'material': 0.1,
+        'world': 0.1,
+        'view': 0.001
+    }
+    # the most orders of the collection axes compared by the schedule
+    MAX_NESTINGS = 720
+
+    class Axis:
+        """ This class is used to hold the information needed to predict
+            the cost of the transitions of an axis. """
+
+        def __init__(self,
+                     name: str,
+                     radix: int,
+                     default_cost: float,
+                     modifies_scene: bool = False,
+                     depends_on_scene: bool = False,
+                     assets: Optional[list] = None) -> None:
+            self._name = name
+            self._radix = radix
+            self._modifies_scene = modifies_scene
+            self._depends_on_scene = depends_on_scene
+            self._cost = ScheduleUtility.transition_cost(name, default_cost,
+                                                         assets)
+
+        def name(self) -> str:
+            """ Returns this axis' name. """
+
+            return self._name
+
+        def radix(self) -> int:
+            """ Returns this axis' number of states. """
+
+            return self._radix
+
+        def cost(self) -> float:
+            """ Returns this axis' predicted transition time. """
+
+            return self._cost
+
+        def modifies_scene(self) -> bool:
+            """ Returns whether this axis replaces objects in the scene. """
+
+            return self._modifies_scene
+
+        def depends_on_scene(self) -> bool:
+            """ Returns whether this axis is applied again after objects
+                in the scene are replaced. """
+
+            return self._depends_on_scene
+
+    class Schedule:
+        """ This class is used to hold a traversal and its prediction. """
+
+        def __init__(self,
+                     traversal_order: str,
+                     nesting: list,
+                     transitions: int,
+                     cost: float) -> None:
+            self._traversal_order = traversal_order
+            self._nesting = nesting
+            self._transitions = transitions
+            self._cost = cost
+
+        def traversal_order(self) -> str:
+            """ Returns the scheduled traversal order. """
+
+            return self._traversal_order
+
+        def nesting(self) -> list:
+            """ Returns the scheduled nesting of the axes, from the
+                outermost to the innermost. """
+
+            return self._nesting
+
+        def transitions(self) -> int:
+            """ Returns the predicted number of transitions. """
+
+            return self._transitions
+
+        def cost(self) -> float:
+            """ Returns the predicted time of all transitions. """
+
+            return self._cost
+
+    @staticmethod
+    def transition_cost(name: str,
+                        default_cost: float,
+                        assets: Optional[list] = None) -> float:
+        """ Returns the mean recorded transition time of an axis. When
+            assets are provided, the mean of each asset is used. """
+
+        axis_cost = cost_history().mean("transition", name)
+        if axis_cost is None:
+            axis_cost = default_cost
+
+        if not assets:
+            return axis_cost
+
+        asset_costs = [cost_history().mean("transition", name, asset)
+                       for asset in assets]
+        return sum(axis_cost if asset_cost is None else asset_cost
+                   for asset_cost in asset_costs) / len(asset_costs)
+
+    @staticmethod
+    def step_classes(radices: list,
+                     traversal_order: str) -> list:
+        """ Returns a (count, changed positions) pair for each class of step
+            between successive iterations of the provided traversal. """
+
+        step_classes = list()
+        prefix = 1
+        for position, radix in enumerate(radices):
+            # the axis at this position changes radix - 1 times for each
+            # state of the axes outside of it
+            count = prefix * (radix - 1)
+            prefix *= radix
+            if count == 0:
+                continue
+
+            changed = [position]
+            # an odometer also resets the inner axes
+            if traversal_order == 'odometer':
+                changed.extend([inner for inner in range(position + 1,
+                                                         len(radices))
+                                if radices[inner] > 1])
+
+            step_classes.append((count, changed))
+
+        return step_classes
+
+    @staticmethod
+    def predict(axes: list,
+                traversal_order: str,
+                nesting: list) -> 'ScheduleUtility.Schedule':
+        """ Predicts the transitions of the provided traversal. """
+
+        # every axis is applied once at the start
+        transitions = len(axes)
+        cost = sum(axis.cost() for axis in axes)
+        radices = [axes[axis].radix() for axis in nesting]
+        for count, positions in ScheduleUtility.step_classes(radices,
+                                                             traversal_order):
+            changed = {nesting[position] for position in positions}
+            # the axes are applied in order the same as when seeking,
+            # replaced objects require the dependent axes to be applied again
+            scene_modified = False
+            for axis in range(len(axes)):
+                if axis in changed or (scene_modified
+                                       and axes[axis].depends_on_scene()):
+                    scene_modified |= axes[axis].modifies_scene()
+                    transitions += count
+                    cost += count * axes[axis].cost()
+
+        return ScheduleUtility.Schedule(traversal_order, list(nesting),
+                                        transitions, cost)
+
+    @staticmethod
+    def change_weight(axis: 'ScheduleUtility.Axis') -> float:
+        """ Returns the weight used to nest the provided axis. Swapping two
+            neighbouring axes is cheaper when the axis with the greater
+            cost * radix / (radix - 1) is outside, so the axes are nested
+            in decreasing weight. Axes with a single state never change. """
+
+        if axis.radix() <= 1:
+            return float('inf')
+
+        return axis.cost() * axis.radix() / (axis.radix() - 1)
+
+    @staticmethod
+    def candidate_nestings(axes: list) -> list:
+        """ Returns the nestings compared by the schedule. The configured
+            nesting comes first, then the axes sorted by change weight, then
+            the orders of the collection axes within the configured nesting,
+            up to MAX_NESTINGS. Permuting every axis grows factorially. """
+
+        configured = list(range(len(axes)))
+        nestings = [configured,
+                    sorted(configured, key=lambda axis: -ScheduleUtility
+                           .change_weight(axes[axis]))]
+        collection_axes = [axis for axis in configured
+                           if axes[axis].modifies_scene()]
+        for order in islice(permutations(collection_axes),
+                            ScheduleUtility.MAX_NESTINGS):
+            collection_order = iter(order)
+            nestings.append([next(collection_order)
+                             if axis in collection_axes else axis
+                             for axis in configured])
+
+        unique = list()
+        for nesting in nestings:
+            if nesting not in unique:
+                unique.append(nesting)
+
+        return unique
+
+    @staticmethod
+    def schedule(axes: list) -> 'ScheduleUtility.Schedule':
+        """ Returns the traversal order and nesting with the lowest
+            predicted cost among the candidate nestings. The configured
+            nesting wins any ties. """
+
+        best = None
+        for nesting in ScheduleUtility.candidate_nestings(axes):
+            for traversal_order in IterationSpace.traversal_map:
+                schedule = ScheduleUtility.predict(axes, traversal_order,
+                                                   list(nesting))
+                if best is None or schedule.cost() < best.cost():
+                    best = schedule
+
+        return best
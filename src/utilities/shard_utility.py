@@ -0,0 +1,92 @@
+""" This utility class splits the render space into shards so that
+    multiple Blender processes can render in parallel.
+"""
+
+from typing import Optional
+
+from src.parsers.settings_parser import app_settings, run_settings
+from src.utilities.validation_utility import ValidationUtility
+
+
+class ShardUtility:
+    """ This class provides the sharding operations. Shards are cut along
+        the files of the outermost collection so that each Blender process
+        only appends the outermost files that it renders. """
+
+    @staticmethod
+    def shard_bounds(count: int,
+                     shard_index: int,
+                     shard_count: int) -> tuple:
+        """ Returns the start and end (exclusive) indices of the provided
+            shard when splitting count items as evenly as possible. """
+
+        return (count * shard_index // shard_count,
+                count * (shard_index + 1) // shard_count)
+
+    @staticmethod
+    def outermost_collection() -> str:
+        """ Returns the collection that changes the least often, this is
+            the collection the shards are cut along. """
+
+        return app_settings().immaterial_collections()[0]
+
+    @staticmethod
+    def shard_count(files: dict,
+                    workers: int) -> int:
+        """ Returns the number of shards to use for the provided files.
+            There is never more than one shard per outermost file. """
+
+        if not app_settings().immaterial_collections():
+            return 1
+
+        validated_files = ValidationUtility.validate_files(files)
+        outermost_files = \
+            validated_files[ShardUtility.outermost_collection()]
+        return max(min(workers, len(outermost_files)), 1)
+
+    @staticmethod
+    def outermost_shard(files: dict,
+                        shard_index: Optional[int] = None,
+                        shard_count: Optional[int] = None) -> Optional[tuple]:
+        """ Returns the (start, count) of the provided shard's outermost
+            files, where count is the number of outermost files of every
+            shard. Returns None when the files are not sharded. """
+
+        if shard_index is None or shard_count is None:
+            shard_index = run_settings().shard_index()
+            shard_count = run_settings().shard_count()
+
+        if shard_count <= 1 or not app_settings().immaterial_collections():
+            return None
+
+        outermost_files = ValidationUtility.validate_files(files)[
+            ShardUtility.outermost_collection()
+        ]
+        start, _ = ShardUtility.shard_bounds(len(outermost_files),
+                                             shard_index, shard_count)
+        return start, len(outermost_files)
+
+    @staticmethod
+    def files_for_shard(files: dict,
+                        shard_index: Optional[int] = None,
+                        shard_count: Optional[int] = None) -> dict:
+        """ Returns the files rendered by the provided shard, by default
+            the shard of this Blender process as specified in run settings.
+            The outermost collection only retains the files for the shard. """
+
+        if shard_index is None or shard_count is None:
+            shard_index = run_settings().shard_index()
+            shard_count = run_settings().shard_count()
+
+        if shard_count <= 1 or not app_settings().immaterial_collections():
+            return files
+
+        sharded_files = ValidationUtility.validate_files(files)
+        collection = ShardUtility.outermost_collection()
+        start, end = ShardUtility.shard_bounds(
+            len(sharded_files[collection]),
+            shard_index,
+            shard_count
+        )
+        sharded_files[collection] = sharded_files[collection][start:end]
+        return sharded_files
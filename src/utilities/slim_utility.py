@@ -0,0 +1,86 @@
+""" This utility class writes the slim files of the slim asset cache.
+"""
+
+from hashlib import sha1
+from os import makedirs, path
+
+from bpy import data
+
+from src.parsers.settings_parser import app_settings
+from src.trackers.slim_cache import slim_cache
+from src.utilities.clear_utility import ClearUtility
+from src.utilities.material_utility import MaterialUtility
+
+
+class SlimUtility:
+    """ This class provides the slimming operations. Only the file's
+        collection, or the material file's materials, are loaded, and
+        Blender writes them with the data they depend on. Workspaces,
+        scenes and other collections are left behind. """
+
+    @staticmethod
+    def unpack_images(images: list) -> None:
+        """ Writes the packed images to the image directory of the cache
+            and points the images at them. Images with the same contents
+            are written once. """
+
+        for image in images:
+            if image.packed_file is None:
+                continue
+
+            contents = bytes(image.packed_file.data)
+            extension = path.splitext(image.filepath)[1] \
+                or '.' + image.file_format.lower()
+            image_path = slim_cache().image_path(sha1(contents).hexdigest(),
+                                                 extension)
+            if not path.isfile(image_path):
+                makedirs(path.dirname(image_path), exist_ok=True)
+                with open(image_path, "wb") as image_file:
+                    image_file.write(contents)
+
+            image.unpack(method='REMOVE')
+            image.filepath = image_path
+
+    @staticmethod
+    def slim_file(file_path: str,
+                  collection: str,
+                  slim_path: str,
+                  unpack_images: bool = False) -> bool:
+        """ Writes the slim file of the provided file's collection. Returns
+            whether the file contained anything to write. """
+
+        is_material_collection = \
+            collection == app_settings().material_collection()
+        used_names = MaterialUtility.used_material_names(file_path) \
+            if is_material_collection else set()
+        images = set(data.images)
+        with data.libraries.load(file_path, link=False) \
+                as (data_from, data_to):
+            if is_material_collection:
+                data_to.materials = [name for name in data_from.materials
+                                     if name in used_names]
+            elif collection in data_from.collections:
+                data_to.collections = [collection]
+
+        datablocks = [datablock for datablock in (data_to.materials
+                                                  if is_material_collection
+                                                  else data_to.collections)
+                      if datablock is not None]
+        if datablocks:
+            if unpack_images:
+                SlimUtility.unpack_images([image for image in data.images
+                                           if image not in images])
+
+            makedirs(path.dirname(slim_path), exist_ok=True)
+            # absolute paths keep the external files found from the cache
+            data.libraries.write(slim_path, set(datablocks),
+                                 path_remap='ABSOLUTE', fake_user=True)
+
+        # the loaded data is not part of the scene, so remove it and the
+        # data it used
+        objects = [obj for datablock in datablocks
+                   if not is_material_collection
+                   for obj in datablock.all_objects]
+        data.batch_remove(ids=objects + datablocks)
+        ClearUtility.purge_orphans()
+        return bool(datablocks)
@@ -3,6 +3,7 @@
 """
 
 from src.parsers.settings_parser import app_settings
+from src.trackers.asset_index import asset_index, has_asset_index
 from src.utilities.clean_utility import CleanUtility
 
 
@@ -25,7 +26,8 @@ class ValidationUtility:
 
     @staticmethod
     def validate_files(files: dict) -> dict:
-        """ Validates each of the files provided. """
+        """ Validates each of the files provided. Files that the asset
+            index knows do not contain their collection are removed. """
 
         validated_files = dict()
 
@@ -36,6 +38,11 @@ class ValidationUtility:
                                                 CleanUtility.clean_file_component(file),
                                                 file_list,
                                                 directory)
+            if has_asset_index():
+                validated_files[directory] = [
+                    file for file in validated_files[directory]
+                    if asset_index().is_valid(file)
+                ]
         return validated_files
 
     @staticmethod
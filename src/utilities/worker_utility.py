@@ -0,0 +1,216 @@
+""" This utility class provides the persistent worker pool. Workers are
+    long lived Blender processes that keep the template and material
+    library loaded and render the jobs submitted to them.
+"""
+
+from fcntl import flock, LOCK_EX, LOCK_NB, LOCK_UN
+from glob import glob
+from json import dumps, loads
+from os import makedirs, path, remove
+from socket import AF_UNIX, SOCK_STREAM, socket
+from subprocess import Popen, STDOUT
+from threading import Lock
+from time import sleep, time
+from typing import Optional
+from uuid import uuid4
+
+from src.classes.exceptions import InvalidConfigurationException
+from src.parsers.settings_parser import app_settings
+
+
+class WorkerUtility:
+    """ This class provides the worker pool protocol. A job or command is
+        sent to a worker as a single line of json over the worker's Unix
+        socket and the worker replies with a single line of json. A worker
+        only renders jobs for the settings files it was started with, it
+        replies with a mismatch status to jobs for other settings files and
+        with a stale status when its own settings files or the material
+        files have changed. """
+
+    # seconds to wait for a spawned worker to finish loading
+    STARTUP_TIMEOUT = 600
+    # guards the sockets claimed by jobs submitted at the same time
+    claim_lock = Lock()
+
+    @staticmethod
+    def pool_dir() -> str:
+        """ Returns the directory holding the socket of each worker. The
+            relative path keeps the socket path within the length limit,
+            workers are started from the same directory as the client. """
+
+        return path.relpath(path.join(app_settings().paths().log_dir(),
+                                      'workers'))
+
+    @staticmethod
+    def lock_path(socket_path: str) -> str:
+        """ Returns the file a worker locks while it renders a job. """
+
+        return socket_path + '.lock'
+
+    @staticmethod
+    def signature(parameters: dict) -> dict:
+        """ Returns the signature of the provided settings files. A worker
+            only accepts jobs with the signature it was started with, so
+            editing a settings file retires the running workers. """
+
+        return {name: [path.abspath(file_path), path.getmtime(file_path)]
+                for name, file_path in parameters.items()}
+
+    @staticmethod
+    def file_signature(file_paths: list) -> list:
+        """ Returns the signature of the provided files, their paths,
+            modified times and sizes. A worker compares the signature of the
+            material files before each job, so adding, removing or editing
+            a material file retires it. """
+
+        return [[path.abspath(file_path), path.getmtime(file_path),
+                 path.getsize(file_path)] for file_path in file_paths]
+
+    @staticmethod
+    def job(parameters: dict,
+            shard_index: int = 0,
+            shard_count: int = 1,
+            iteration_ranges: Optional[list] = None,
+            changed_files: Optional[list] = None) -> dict:
+        """ Returns a render job for the provided settings files. When
+            changed files are provided, only the renders using them are
+            rendered. """
+
+        return {'type': 'render',
+                'signature': WorkerUtility.signature(parameters),
+                'shard_index': shard_index,
+                'shard_count': shard_count,
+                'iteration_ranges': iteration_ranges,
+                'changed_files': changed_files}
+
+    @staticmethod
+    def receive(connection: socket) -> dict:
+        """ Reads a single message from the provided connection. """
+
+        with connection.makefile("r") as stream:
+            line = stream.readline()
+
+        return loads(line) if line else {'type': 'closed',
+                                         'status': 'closed'}
+
+    @staticmethod
+    def respond(connection: socket,
+                message: dict) -> None:
+        """ Writes a single message to the provided connection. """
+
+        connection.sendall((dumps(message) + '\n').encode())
+
+    @staticmethod
+    def request(socket_path: str,
+                message: dict,
+                timeout: Optional[float] = None) -> dict:
+        """ Sends the provided message to a worker and returns its reply.
+            Returns a closed status when the worker is not running. """
+
+        try:
+            with socket(AF_UNIX, SOCK_STREAM) as connection:
+                connection.settimeout(timeout)
+                connection.connect(socket_path)
+                WorkerUtility.respond(connection, message)
+                return WorkerUtility.receive(connection)
+        except (ConnectionError, FileNotFoundError):
+            return {'status': 'closed'}
+
+    @staticmethod
+    def is_busy(socket_path: str) -> bool:
+        """ Returns whether the worker is currently rendering a job. """
+
+        with open(WorkerUtility.lock_path(socket_path), "a") as lock_file:
+            try:
+                flock(lock_file, LOCK_EX | LOCK_NB)
+            except BlockingIOError:
+                return True
+
+            flock(lock_file, LOCK_UN)
+            return False
+
+    @staticmethod
+    def remove_socket(socket_path: str) -> None:
+        """ Removes the socket and lock files of a worker. """
+
+        for file_path in [socket_path, WorkerUtility.lock_path(socket_path)]:
+            if path.exists(file_path):
+                remove(file_path)
+
+    @staticmethod
+    def idle_workers() -> list:
+        """ Returns the socket of each idle worker. """
+
+        return [socket_path for socket_path
+                in sorted(glob(path.join(WorkerUtility.pool_dir(), '*.sock')))
+                if not WorkerUtility.is_busy(socket_path)]
+
+    @staticmethod
+    def spawn(command: list,
+              claimed: set) -> str:
+        """ Launches a new worker with the provided Blender command and
+            waits until it accepts jobs. The worker's socket is added to
+            claimed before launching and returned. """
+
+        makedirs(WorkerUtility.pool_dir(), exist_ok=True)
+        socket_path = path.join(WorkerUtility.pool_dir(),
+                                'worker_' + uuid4().hex[:8] + '.sock')
+        with WorkerUtility.claim_lock:
+            claimed.add(socket_path)
+
+        # the worker outlives this process, so it writes to its own log
+        with open(path.splitext(socket_path)[0] + '_log.txt', "w") as log:
+            Popen(command + ["--serve", socket_path], stdout=log,
+                  stderr=STDOUT, start_new_session=True)
+
+        start = time()
+        while time() - start < WorkerUtility.STARTUP_TIMEOUT:
+            if path.exists(socket_path) and WorkerUtility.request(
+                    socket_path, {'type': 'ping'})['status'] == 'ready':
+                return socket_path
+            sleep(0.5)
+
+        raise InvalidConfigurationException("Worker failed to start: "
+                                            + socket_path)
+
+    @staticmethod
+    def submit(command: list,
+               job: dict,
+               claimed: Optional[set] = None) -> dict:
+        """ Submits the provided job to an idle worker, a new worker is
+            launched when none accept it. Sockets in claimed are skipped
+            and the chosen socket is added to it. Returns the reply. """
+
+        claimed = set() if claimed is None else claimed
+        for socket_path in WorkerUtility.idle_workers():
+            with WorkerUtility.claim_lock:
+                if socket_path in claimed:
+                    continue
+
+                claimed.add(socket_path)
+
+            reply = WorkerUtility.request(socket_path, job)
+            if reply['status'] in ['done', 'error']:
+                return reply
+
+            # the worker was started with other settings or has exited
+            if reply['status'] == 'closed':
+                WorkerUtility.remove_socket(socket_path)
+
+        socket_path = WorkerUtility.spawn(command, claimed)
+        return WorkerUtility.request(socket_path, job)
+
+    @staticmethod
+    def shutdown() -> int:
+        """ Shuts down each idle worker. Returns the number shut down. """
+
+        count = 0
+        for socket_path in WorkerUtility.idle_workers():
+            if WorkerUtility.request(socket_path,
+                                     {'type': 'shutdown'})['status'] \
+                    == 'closed':
+                WorkerUtility.remove_socket(socket_path)
+            else:
+                count += 1
+
+        return count